@@ -0,0 +1,153 @@
+import os
+from typing import Dict, List, Tuple
+
+Coordinate = Tuple[str, str, str]
+
+GROUP = 'bench'
+
+PROJECT = '''<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <modelVersion>4.0.0</modelVersion>
+{}
+</project>
+'''
+
+
+def _coordinate(group: str, artifact: str, version: str) -> str:
+    return '  <groupId>{}</groupId><artifactId>{}</artifactId><version>{}</version>'.format(group, artifact, version)
+
+
+def _parent(group: str, artifact: str, version: str) -> str:
+    return '  <parent><groupId>{}</groupId><artifactId>{}</artifactId><version>{}</version></parent>'.format(
+        group, artifact, version)
+
+
+def _dependency(group: str, artifact: str, version: str = None, scope: str = None) -> str:
+    v = '<groupId>{}</groupId><artifactId>{}</artifactId>'.format(group, artifact)
+    if version is not None:
+        v += '<version>{}</version>'.format(version)
+    if scope is not None:
+        v += '<scope>{}</scope>'.format(scope)
+    return '<dependency>{}</dependency>'.format(v)
+
+
+def _dependencies(deps: List[str], managed: bool = False) -> str:
+    v = '  <dependencies>\n{}\n  </dependencies>'.format('\n'.join('    ' + d for d in deps))
+    if managed:
+        return '  <dependencyManagement>\n{}\n  </dependencyManagement>'.format(v)
+    return v
+
+
+def _properties(properties: Dict[str, str]) -> str:
+    return '  <properties>\n{}\n  </properties>'.format(
+        '\n'.join('    <{0}>{1}</{0}>'.format(k, v) for k, v in properties.items()))
+
+
+# A synthetic repository: the poms by coordinate, & the coordinates a benchmark resolves
+class Corpus:
+
+    def __init__(self, name: str):
+        self.name = name
+        self.poms: Dict[Coordinate, bytes] = {}
+        self.roots: List[Coordinate] = []
+
+    def add(self, artifact: str, version: str, *parts: str, group: str = GROUP) -> Coordinate:
+        self.poms[(group, artifact, version)] = PROJECT.format('\n'.join(parts)).encode('UTF-8')
+        return group, artifact, version
+
+    @property
+    def size(self) -> int:
+        return sum(len(v) for v in self.poms.values())
+
+    # Lay the poms out like a maven repository under `root`
+    def write(self, root: str):
+        for (g, a, v), content in self.poms.items():
+            directory = os.path.join(root, *g.split('.'), a, v)
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, '{}-{}.pom'.format(a, v)), 'wb') as f:
+                f.write(content)
+
+
+# A leaf under `depth` parents, every parent adds properties & management referring to its parent's
+def deep_chain(depth: int = 64, managed: int = 16) -> Corpus:
+    corpus = Corpus('deep-chain')
+    parent = None
+    for i in range(depth):
+        properties = {'level{}.version'.format(i): '${{level{}.version}}.{}'.format(i - 1, i) if i else '1'}
+        deps = [_dependency('lib{}'.format(i), 'lib{}-{}'.format(i, j), '${{level{}.version}}'.format(i))
+                for j in range(managed)]
+        parts = [_coordinate(GROUP, 'parent{}'.format(i), '1'), _properties(properties), _dependencies(deps, True)]
+        if parent is not None:
+            parts.insert(0, _parent(*parent))
+        parent = corpus.add('parent{}'.format(i), '1', *parts)
+    deps = [_dependency('lib{}'.format(i), 'lib{}-0'.format(i)) for i in range(depth)]
+    corpus.roots.append(corpus.add('leaf', '1', _parent(*parent), _coordinate(GROUP, 'leaf', '1'),
+                                   _dependencies(deps)))
+    return corpus
+
+
+# Roots importing one bom of `size` managed dependencies, each root declaring a slice of them without versions
+def huge_bom(size: int = 4000, roots: int = 16, used: int = 64) -> Corpus:
+    corpus = Corpus('huge-bom')
+    deps = [_dependency('lib', 'lib-{}'.format(i), '1.{}'.format(i)) for i in range(size)]
+    corpus.add('bom', '1', _coordinate(GROUP, 'bom', '1'), _dependencies(deps, True))
+    for r in range(roots):
+        deps = [_dependency('lib', 'lib-{}'.format((r * used + i) % size)) for i in range(used)]
+        corpus.roots.append(corpus.add('app{}'.format(r), '1', _coordinate(GROUP, 'app{}'.format(r), '1'),
+                                       _dependencies([_dependency(GROUP, 'bom', '1', 'import')], True),
+                                       _dependencies(deps)))
+    return corpus
+
+
+# A pom of `count` properties referring to each other as a tree, & dependencies made of them
+def property_heavy(count: int = 2000, used: int = 256) -> Corpus:
+    corpus = Corpus('property-heavy')
+    # p{i} refers to p{i // 2}, so references are log(count) deep
+    properties = {'p{}'.format(i): '${{p{}}}.{}'.format(i // 2, i) if i else '1' for i in range(count)}
+    deps = [_dependency('lib', 'lib-${{p{}}}'.format(i), '${{p{}}}'.format(count - 1 - i)) for i in range(used)]
+    corpus.roots.append(corpus.add('props', '1', _coordinate(GROUP, 'props', '1'), _properties(properties),
+                                   _dependencies(deps)))
+    return corpus
+
+
+# A pom of `count` profiles, each activated by a property & adding properties & dependencies
+def many_profiles(count: int = 256, deps: int = 8) -> Corpus:
+    corpus = Corpus('many-profiles')
+    profiles = []
+    for i in range(count):
+        profiles.append(
+            '    <profile><id>profile{0}</id>\n'
+            '      <activation><property><name>profile{0}</name></property></activation>\n'
+            '      <properties><profile{0}.version>{0}</profile{0}.version></properties>\n'
+            '      <dependencies>{1}</dependencies>\n'
+            '    </profile>'.format(i, ''.join(_dependency('lib', 'lib-{}-{}'.format(i, j),
+                                                           '${{profile{}.version}}'.format(i))
+                                             for j in range(deps))))
+    corpus.roots.append(corpus.add('profiles', '1', _coordinate(GROUP, 'profiles', '1'),
+                                   '  <profiles>\n{}\n  </profiles>'.format('\n'.join(profiles))))
+    return corpus
+
+
+# `depth` levels of `width` artifacts sharing one parent, every artifact depends on the whole next level
+def wide_graph(width: int = 48, depth: int = 4) -> Corpus:
+    corpus = Corpus('wide-graph')
+    parent = corpus.add('graph-parent', '1', _coordinate(GROUP, 'graph-parent', '1'),
+                        _properties({'graph.version': '1'}))
+    for level in range(depth, 0, -1):
+        deps = [] if level == depth else [_dependency(GROUP, 'node{}-{}'.format(level + 1, j), '${graph.version}')
+                                           for j in range(width)]
+        for i in range(width):
+            corpus.add('node{}-{}'.format(level, i), '1', _parent(*parent),
+                       '  <artifactId>node{}-{}</artifactId>'.format(level, i), _dependencies(deps))
+    deps = [_dependency(GROUP, 'node1-{}'.format(j), '1') for j in range(width)]
+    corpus.roots.append(corpus.add('graph', '1', _coordinate(GROUP, 'graph', '1'), _dependencies(deps)))
+    return corpus
+
+
+GENERATORS = {
+    'deep-chain': deep_chain,
+    'huge-bom': huge_bom,
+    'property-heavy': property_heavy,
+    'many-profiles': many_profiles,
+    'wide-graph': wide_graph,
+}
@@ -0,0 +1,162 @@
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from pom_helper import POM, POMRegistry, TransitiveResolver, Metrics, set_listener
+from pom_helper.pom_helper import fetch_bytes
+from pom_helper.profiles import ActivationContext
+from pom_helper.stub import StubRepository
+
+from .corpus import Corpus, GENERATORS
+
+COLUMNS = ['scenario', 'poms', 'corpus KB', 'fetch ms', 'get_root ms', 'resolve ms', '_check_ref ms', 'fetches',
+           'fetched KB', 'peak KB']
+
+
+# Serves a corpus over localhost http
+class HTTPRepository:
+
+    def __init__(self, corpus: Corpus):
+        self.stub = StubRepository()
+        for (g, a, v), content in corpus.poms.items():
+            self.stub.add(g, a, v, content)
+
+    def __enter__(self):
+        self.stub.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        self.stub.__exit__(*args)
+
+    def handler(self, group: str, artifact: str, version: str) -> str:
+        return self.stub.handler(group, artifact, version)
+
+
+# Serves a corpus from a maven layout on disk
+class FileRepository:
+
+    def __init__(self, corpus: Corpus):
+        self.corpus = corpus
+        self.directory = tempfile.TemporaryDirectory(prefix='pom-bench-')
+
+    def __enter__(self):
+        self.corpus.write(self.directory.name)
+        return self
+
+    def __exit__(self, *args):
+        self.directory.cleanup()
+
+    def handler(self, group: str, artifact: str, version: str) -> str:
+        return 'file://{}/{}/{}/{}/{}-{}.pom'.format(self.directory.name, group.replace('.', '/'), artifact, version,
+                                                     artifact, version)
+
+
+@contextmanager
+def timer(result: Dict[str, float], key: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        result[key] = (time.perf_counter() - start) * 1000
+
+
+def _resolve(corpus: Corpus, handlers, registry: POMRegistry) -> List[POM]:
+    poms = [POM.from_coordinate(g, a, v, url_handlers=handlers, registry=registry) for g, a, v in corpus.roots]
+    for pom in poms:
+        pom.get_dependencies()
+        if pom.get_profiles():
+            # activate every other profile
+            ids = list(pom.get_profiles())[::2]
+            pom.get_effective_dependencies(context=ActivationContext(properties={i: '' for i in ids}))
+    if corpus.name == 'wide-graph':
+        resolver = TransitiveResolver(url_handlers=handlers, registry=registry, on_error=None)
+        for g, a, v in corpus.roots:
+            resolver.resolve(g, a, v)
+    return poms
+
+
+def measure(corpus: Corpus, repository) -> Dict[str, object]:
+    result: Dict[str, object] = {'scenario': corpus.name, 'poms': len(corpus.poms), 'corpus KB': corpus.size / 1024}
+    handlers = [repository.handler]
+    with timer(result, 'fetch ms'):
+        for g, a, v in corpus.poms:
+            fetch_bytes([repository.handler(g, a, v)])
+    with timer(result, 'get_root ms'):
+        for content in corpus.poms.values():
+            POM.from_bytes(content).get_root()
+    metrics = Metrics()
+    set_listener(metrics)
+    tracemalloc.start()
+    try:
+        with timer(result, 'resolve ms'):
+            poms = _resolve(corpus, handlers, POMRegistry())
+        result['peak KB'] = tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+        set_listener(None)
+    snapshot = metrics.snapshot()
+    result['fetches'] = snapshot['timers']['fetch']['count'] if 'fetch' in snapshot['timers'] else 0
+    result['fetched KB'] = sum(p['size'] for p in snapshot['poms'].values()) / 1024
+    # interpolate every property again, from a cold memo
+    with timer(result, '_check_ref ms'):
+        for pom in poms:
+            pom._resolved.clear()
+            for k in pom.get_effective_properties():
+                pom._check_ref('${' + k + '}')
+    return result
+
+
+def _format(v) -> str:
+    if v is None:
+        return '-'
+    if isinstance(v, float):
+        return '{:.1f}'.format(v)
+    return str(v)
+
+
+def report(results: List[Dict[str, object]]) -> str:
+    rows = [COLUMNS] + [[_format(r[c]) for c in COLUMNS] for r in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(COLUMNS))]
+    return '\n'.join('  '.join(v.rjust(w) if i else v.ljust(w) for i, (v, w) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run',
+                                     description='Benchmark pom_helper over synthetic corpora')
+    parser.add_argument('--scenario', action='append', choices=sorted(GENERATORS),
+                        help='run only these scenarios, all by default')
+    parser.add_argument('--repository', choices=['http', 'file'], default='http',
+                        help='serve the corpus over localhost http or from disk')
+    parser.add_argument('--repeat', type=int, default=3, help='keep the fastest of the runs')
+    parser.add_argument('--output', help='also write the report to this file')
+    args = parser.parse_args(argv)
+    logging.getLogger().setLevel(logging.ERROR)
+    results = []
+    for name in args.scenario or list(GENERATORS):
+        corpus = GENERATORS[name]()
+        runs = []
+        for _ in range(max(1, args.repeat)):
+            repository = HTTPRepository(corpus) if args.repository == 'http' else FileRepository(corpus)
+            with repository:
+                runs.append(measure(corpus, repository))
+        best = dict(runs[0])
+        for k in best:
+            if k.endswith(' ms'):
+                best[k] = min(r[k] for r in runs)
+        results.append(best)
+    text = report(results)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + os.linesep)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
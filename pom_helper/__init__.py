@@ -1,3 +1,23 @@
-from .pom_helper import POM, Dependency, Package, Handler, POMError, DEFAULT_HANDLERS
+from .pom_helper import POM, Profile, Dependency, Package, Handler, POMError, DEFAULT_HANDLERS
+from .aio import AsyncPOM, AsyncTransport, set_async_transport, aresolve_many
+from .cache import DiskCache, FreshnessPolicy, set_cache, get_cache
+from .graph import DependencyGraph, TransitiveResolver, resolve_graph
+from .instrument import Listener, Listeners, Metrics, Trace, set_listener, get_listener
+from .local import LocalRepository
+from .model import POMModel
+from .profiles import ActivationContext
+from .reactor import Reactor, load_reactor
+from .registry import POMRegistry, REGISTRY
+from .resolver import resolve_many
+from .routing import RouteStats, ROUTES, set_race
+from .table import DependencyTable, StringTable, export_sqlite
+from .transport import HTTPTransport, TransportError, TransportCancelled, set_transport, get_transport
 
-__all__ = ['POM', 'Dependency', 'Package', 'Handler', 'POMError', 'DEFAULT_HANDLERS']
+__all__ = ['POM', 'Dependency', 'Package', 'Handler', 'POMError', 'DEFAULT_HANDLERS', 'POMRegistry', 'REGISTRY', 'POMModel',
+           'DiskCache', 'FreshnessPolicy', 'set_cache', 'get_cache',
+           'HTTPTransport', 'TransportError', 'TransportCancelled', 'set_transport', 'get_transport',
+           'RouteStats', 'ROUTES', 'set_race', 'resolve_many',
+           'AsyncPOM', 'AsyncTransport', 'set_async_transport', 'aresolve_many',
+           'DependencyGraph', 'TransitiveResolver', 'resolve_graph', 'LocalRepository',
+           'Profile', 'ActivationContext', 'Listener', 'Listeners', 'Metrics', 'Trace', 'set_listener', 'get_listener',
+           'Reactor', 'load_reactor', 'DependencyTable', 'StringTable', 'export_sqlite']
@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import weakref
+from typing import Dict, List, Optional, Callable, Any, Iterable, AsyncIterator, Tuple
+
+from .cache import DiskCache, get_cache
+from .instrument import get_listener, now
+from .pom_helper import POM, Package, Dependency, Handler, POMError, POMMissing, DEFAULT_HANDLERS, deferred_fetch, \
+    is_none, is_remote, decode, _fetch_local, _accept, _downloaded, _validators, _stale
+from .model import POMModel
+from .profiles import ActivationContext
+from .registry import REGISTRY, POMRegistry
+from .resolver import ErrorHandler, log_error
+from .routing import ROUTES, RouteStats, is_race
+from .transport import Response, TransportError, RETRY_STATUS, DEFAULT_POOL_SIZE, DEFAULT_CONNECT_TIMEOUT, \
+    DEFAULT_READ_TIMEOUT, DEFAULT_RETRIES, DEFAULT_BACKOFF, DEFAULT_MAX_BACKOFF, retried, content_length
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+# Non-blocking counterpart of `HTTPTransport`, at most `limit` requests are in flight at once.
+# The session is bound to the running loop, & made again when used from another loop.
+class AsyncTransport:
+
+    def __init__(self, limit: int = DEFAULT_POOL_SIZE, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, max_backoff: float = DEFAULT_MAX_BACKOFF):
+        if aiohttp is None:
+            raise POMError('aiohttp is required by the asyncio api, install `pom-helper[async]`')
+        self.limit = limit
+        self.timeout = aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self.limit),
+                                                  timeout=self.timeout, auto_decompress=True)
+            self._loop = loop
+        return self._session
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> Response:
+        session = self._get_session()
+        attempt = 0
+        while True:
+            try:
+                async with session.get(url, headers=headers) as res:
+                    if res.status not in RETRY_STATUS or attempt >= self.retries:
+                        return Response(status=res.status, content=await res.read(), headers=dict(res.headers),
+                                        received=content_length(res.headers))
+                    logging.warning('[POM] download {} fail with {}, retrying...'.format(url, res.status))
+                    cause = str(res.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.retries:
+                    raise TransportError(url, e)
+                logging.warning('[POM] download {} fail with {}, retrying...'.format(url, e))
+                cause = str(e)
+            retried(url, attempt + 1, cause)
+            await asyncio.sleep(min(self.max_backoff, self.backoff * (2 ** attempt)))
+            attempt += 1
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_transport: Optional[AsyncTransport] = None
+
+
+def set_async_transport(transport: Optional[AsyncTransport]):
+    global _transport
+    _transport = transport
+
+
+def get_async_transport() -> AsyncTransport:
+    global _transport
+    if _transport is None:
+        _transport = AsyncTransport()
+    return _transport
+
+
+async def afetch(urls: List[str], cache: Optional[DiskCache] = None, transport: Optional[AsyncTransport] = None,
+                 group: Optional[str] = None, race: Optional[bool] = None,
+                 routes: Optional[RouteStats] = ROUTES) -> Optional[str]:
+    content = await afetch_bytes(urls, cache=cache, transport=transport, group=group, race=race, routes=routes)
+    if is_none(content):
+        return None
+    return decode(content)
+
+
+async def afetch_bytes(urls: List[str], cache: Optional[DiskCache] = None, transport: Optional[AsyncTransport] = None,
+                       group: Optional[str] = None, race: Optional[bool] = None,
+                       routes: Optional[RouteStats] = ROUTES) -> Optional[bytes]:
+    if is_none(cache):
+        cache = get_cache()
+    if is_none(transport):
+        transport = get_async_transport()
+    if is_none(race):
+        race = is_race()
+    if not is_none(routes):
+        urls = routes.order(urls, group)
+    if not race or len(urls) <= 1:
+        for url in urls:
+            v = await _afetch_one(url, cache, transport, group, routes)
+            if not is_none(v):
+                return v
+        return None
+    # request all at once, but still prefer the earlier handlers
+    tasks = [asyncio.ensure_future(_afetch_one(url, cache, transport, group, routes)) for url in urls]
+    try:
+        for task in tasks:
+            v = await task
+            if not is_none(v):
+                return v
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _afetch_one(url: str, cache: Optional[DiskCache], transport: AsyncTransport, group: Optional[str],
+                      routes: Optional[RouteStats]) -> Optional[bytes]:
+    v = _fetch_local(url, cache)
+    if not is_remote(v):
+        return v
+    logging.warning('[POM] downloading {}...'.format(url))
+    start = now()
+    try:
+        res = await transport.get(url, headers=_validators(url, cache))
+    except TransportError as e:
+        _downloaded(url, None, start)
+        logging.error(e)
+        return _stale(url, cache)
+    _downloaded(url, res, start)
+    return _accept(url, res, cache, group, routes)
+
+
+# The loads in flight, so that the coroutines waiting for the same pom share one download
+_inflight: 'weakref.WeakKeyDictionary[POM, asyncio.Task]' = weakref.WeakKeyDictionary()
+
+
+async def aload(missing: POMMissing, transport: Optional[AsyncTransport] = None):
+    pom = missing.pom
+    task = _inflight.get(pom)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        async def load():
+            start = now()
+            content = await afetch_bytes(missing.urls, transport=transport, group=missing.group)
+            listener = get_listener()
+            if not is_none(listener):
+                listener.fetched(pom.name(), None if is_none(content) else len(content), now() - start)
+            pom.load(content)
+
+        task = asyncio.ensure_future(load())
+        _inflight[pom] = task
+        task.add_done_callback(lambda t: _inflight.pop(pom, None) if _inflight.get(pom) is t else None)
+    await asyncio.shield(task)
+
+
+# The asyncio view of a `POM`.
+# The getters interpret the pom exactly like `POM` does, but every parent, bom or handler url
+# they need is downloaded without blocking the loop, & the poms are shared with the sync api.
+class AsyncPOM:
+
+    def __init__(self, pom: POM, transport: Optional[AsyncTransport] = None):
+        self.pom = pom
+        self._transport = transport
+
+    async def _resolve(self, getter: Callable[[], Any]) -> Any:
+        while True:
+            try:
+                with deferred_fetch():
+                    return getter()
+            except POMMissing as e:
+                await aload(e, self._transport)
+
+    async def get_root(self):
+        return await self._resolve(self.pom.get_root)
+
+    async def get_model(self) -> POMModel:
+        return await self._resolve(self.pom.get_model)
+
+    async def get_group_id(self) -> str:
+        return await self._resolve(self.pom.get_group_id)
+
+    async def get_artifact(self) -> str:
+        return await self._resolve(self.pom.get_artifact)
+
+    async def get_version(self) -> str:
+        return await self._resolve(self.pom.get_version)
+
+    async def get_dependencies(self) -> List[Dependency]:
+        return await self._resolve(self.pom.get_dependencies)
+
+    async def get_dependencies_management(self) -> List[Dependency]:
+        return await self._resolve(self.pom.get_dependencies_management)
+
+    async def get_dependencies_management_index(self) -> Dict[Tuple[str, str], Dependency]:
+        return await self._resolve(self.pom.get_dependencies_management_index)
+
+    async def get_properties(self) -> Optional[Dict[str, str]]:
+        return await self._resolve(self.pom.get_properties)
+
+    async def get_effective_properties(self) -> Dict[str, str]:
+        return await self._resolve(self.pom.get_effective_properties)
+
+    async def get_profiles(self) -> Optional[Dict[str, POM]]:
+        return await self._resolve(self.pom.get_profiles)
+
+    async def get_active_profiles(self, profiles: Optional[Iterable[str]] = None,
+                                  context: Optional[ActivationContext] = None) -> List[str]:
+        return await self._resolve(lambda: self.pom.get_active_profiles(profiles, context))
+
+    async def get_effective_dependencies(self, profiles: Optional[Iterable[str]] = None,
+                                         context: Optional[ActivationContext] = None) -> List[Dependency]:
+        return await self._resolve(lambda: self.pom.get_effective_dependencies(profiles, context))
+
+    async def get_parent(self) -> Optional['AsyncPOM']:
+        parent = await self._resolve(self.pom.get_parent)
+        if is_none(parent):
+            return None
+        return AsyncPOM(parent, self._transport)
+
+    @classmethod
+    def from_coordinate(cls, group: str, artifact: str, version: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                        registry: POMRegistry = REGISTRY, low_memory: bool = False,
+                        transport: Optional[AsyncTransport] = None):
+        return cls(POM.from_coordinate(group, artifact, version, url_handlers=url_handlers, registry=registry,
+                                       low_memory=low_memory), transport)
+
+    @classmethod
+    def from_string(cls, plain: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                    transport: Optional[AsyncTransport] = None):
+        return cls(POM.from_string(plain, url_handlers=url_handlers), transport)
+
+    @classmethod
+    def from_url(cls, url: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                 transport: Optional[AsyncTransport] = None):
+        return cls(POM.from_url(url, url_handlers=url_handlers), transport)
+
+    @classmethod
+    def from_urls(cls, urls: List[str], url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                  transport: Optional[AsyncTransport] = None):
+        return cls(POM.from_urls(urls, url_handlers=url_handlers), transport)
+
+
+# Asyncio counterpart of `resolve_many`, yields the results as they finish
+async def aresolve_many(coordinates: Iterable[Tuple[str, str, str]], url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                        registry: POMRegistry = REGISTRY, transport: Optional[AsyncTransport] = None,
+                        on_error: Optional[ErrorHandler] = log_error,
+                        window: int = 256) -> AsyncIterator[Tuple[Package, List[Dependency]]]:
+    async def resolve(g, a, v):
+        package = Package(group=g, artifact=a, version=v)
+        try:
+            pom = AsyncPOM.from_coordinate(g, a, v, url_handlers=url_handlers, registry=registry,
+                                           transport=transport)
+            return package, await pom.get_dependencies()
+        except Exception as e:
+            if on_error is not None:
+                on_error(package, e)
+            return package, None
+
+    coordinates = iter(coordinates)
+    pending = set()
+    while True:
+        # keep at most `window` coordinates in flight
+        for g, a, v in coordinates:
+            pending.add(asyncio.ensure_future(resolve(g, a, v)))
+            if len(pending) >= window:
+                break
+        if not pending:
+            return
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            package, dependencies = task.result()
+            if not is_none(dependencies):
+                yield package, dependencies
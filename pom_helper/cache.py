@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+from fnmatch import fnmatchcase
+from typing import Optional, List, Dict, Mapping
+from urllib.parse import urlsplit, unquote
+
+from attr import dataclass
+
+# Default directory of the persistent cache
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'pom_helper')
+# How long a 404 is remembered, in seconds
+DEFAULT_NEGATIVE_TTL = 24 * 60 * 60
+# Like maven, a missing file is remembered by a marker next to where the file would be
+SUFFIX_MISSING = '.lastUpdated'
+# The validators of a file, its mtime is when the file was last known up to date
+SUFFIX_META = '.meta'
+# How long a -SNAPSHOT is trusted before it is revalidated, like maven's `daily` update policy
+DEFAULT_SNAPSHOT_TTL = 24 * 60 * 60
+
+
+# How long the cached urls matching `pattern` (`fnmatch` style) are fresh, in seconds;
+# None for never changing, 0 to revalidate on every fetch
+@dataclass
+class FreshnessPolicy:
+    pattern: str
+    ttl: Optional[float]
+
+
+# Releases never change, snapshots are revalidated daily
+DEFAULT_POLICIES: List[FreshnessPolicy] = [
+    FreshnessPolicy('*-SNAPSHOT/*', DEFAULT_SNAPSHOT_TTL),
+    FreshnessPolicy('*', None),
+]
+
+
+# The ttl of the first of `policies` matching `url`, None if it never changes
+def policy_ttl(url: str, policies: List[FreshnessPolicy] = DEFAULT_POLICIES) -> Optional[float]:
+    for policy in policies:
+        if fnmatchcase(url, policy.pattern):
+            return policy.ttl
+    return None
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    name = name.lower()
+    for k, v in headers.items():
+        if k.lower() == name:
+            return v
+    return None
+
+
+# Write aside & rename, so that a concurrent reader never sees a partial file.
+# The temporary file is the writer's own, whether the other writers are threads or processes.
+def _write(path: str, content: bytes):
+    tmp = '{}.{}.{}.tmp'.format(path, os.getpid(), threading.get_ident())
+    with open(tmp, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+# A persistent cache of downloaded poms, laid out like a maven repository under `<directory>/<host>/<path>`,
+# e.g. https://repo1.maven.org/maven2/g/a/v/a-v.pom is kept in <directory>/repo1.maven.org/maven2/g/a/v/a-v.pom
+# A cached file is served as long as the first of `policies` matching its url says it is fresh,
+# after that it is revalidated with its ETag & Last-Modified, & a 304 keeps it for another ttl.
+class DiskCache:
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 policies: Optional[List[FreshnessPolicy]] = None):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.negative_ttl = negative_ttl
+        self.policies = DEFAULT_POLICIES if policies is None else policies
+
+    def path(self, url: str) -> str:
+        parts = urlsplit(url)
+        segments = [s for s in unquote(parts.path).split('/') if s and s not in ('.', '..')]
+        return os.path.join(self.directory, parts.netloc.replace(':', '_') or '_', *segments)
+
+    def get(self, url: str) -> Optional[bytes]:
+        try:
+            with open(self.path(url), 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+
+    # `headers` of the response, whose validators are kept to revalidate the file later
+    def put(self, url: str, content: bytes, headers: Optional[Mapping[str, str]] = None):
+        path = self.path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _write(path, content)
+        self._remove(path + SUFFIX_MISSING)
+        # what never changes is never revalidated
+        if self.ttl(url) is None:
+            return
+        meta = {}
+        for name in ('ETag', 'Last-Modified'):
+            v = None if headers is None else _header(headers, name)
+            if v is not None:
+                meta[name] = v
+        _write(path + SUFFIX_META, json.dumps(meta).encode())
+
+    def ttl(self, url: str) -> Optional[float]:
+        return policy_ttl(url, self.policies)
+
+    # Whether the cached file can be served without asking the repository
+    def is_fresh(self, url: str) -> bool:
+        ttl = self.ttl(url)
+        if ttl is None:
+            return True
+        try:
+            checked = os.stat(self.path(url) + SUFFIX_META).st_mtime
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        return time.time() - checked < ttl
+
+    # The conditional headers to revalidate the cached file with
+    def validators(self, url: str) -> Dict[str, str]:
+        try:
+            with open(self.path(url) + SUFFIX_META, 'r') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, NotADirectoryError, ValueError):
+            return {}
+        headers = {}
+        if 'ETag' in meta:
+            headers['If-None-Match'] = meta['ETag']
+        if 'Last-Modified' in meta:
+            headers['If-Modified-Since'] = meta['Last-Modified']
+        return headers
+
+    # The repository answered 304, the cached file is fresh for another ttl
+    def touch(self, url: str):
+        path = self.path(url) + SUFFIX_META
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with open(path, 'w') as f:
+                json.dump({}, f)
+
+    def is_missing(self, url: str) -> bool:
+        try:
+            mtime = os.stat(self.path(url) + SUFFIX_MISSING).st_mtime
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        if time.time() - mtime < self.negative_ttl:
+            return True
+        # expired, try the repository again
+        self._remove(self.path(url) + SUFFIX_MISSING)
+        return False
+
+    def put_missing(self, url: str):
+        path = self.path(url) + SUFFIX_MISSING
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w'):
+            pass
+        os.utime(path)
+
+    def invalidate(self, url: str):
+        path = self.path(url)
+        self._remove(path)
+        self._remove(path + SUFFIX_MISSING)
+        self._remove(path + SUFFIX_META)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+_cache: Optional[DiskCache] = None
+
+
+# Set the cache used by `fetch`, or `None` to disable it
+def set_cache(cache: Optional[DiskCache]):
+    global _cache
+    _cache = cache
+
+
+def get_cache() -> Optional[DiskCache]:
+    return _cache
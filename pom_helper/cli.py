@@ -0,0 +1,153 @@
+import argparse
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Optional, Iterable, Iterator, Tuple, Set, TextIO, Dict, Any
+
+from .cache import DiskCache, set_cache
+from .local import LocalRepository
+from .pom_helper import POM, Dependency, Handler, POMError, DEFAULT_HANDLERS
+from .registry import REGISTRY
+from .resolver import DEFAULT_WORKERS, DEFAULT_BATCH, _resolve_levels
+
+# (line number, line) of the input
+Item = Tuple[int, str]
+
+
+# A handler of a repository laid out like maven central, e.g. an internal mirror
+def repository_handler(base: str) -> Handler:
+    base = base.rstrip('/')
+
+    def handler(group: str, artifact: str, version: str) -> str:
+        return '{}/{}/{}/{}/{}-{}.pom'.format(base, group.replace('.', '/'), artifact, version, artifact, version)
+
+    return handler
+
+
+def _dependency(d: Dependency) -> Dict[str, Any]:
+    return {'group': d.group, 'artifact': d.artifact, 'version': d.version, 'scope': d.scope,
+            'optional': d.optional, 'exclusions': [list(e) for e in d.exclusions]}
+
+
+def _record(pom: POM) -> Dict[str, Any]:
+    return {'group': pom.get_group_id(), 'artifact': pom.get_artifact(), 'version': pom.get_version(),
+            'dependencies': [_dependency(d) for d in pom.get_dependencies()],
+            'management': [_dependency(d) for d in pom.get_dependencies_management()]}
+
+
+# A line is `group:artifact:version`, or the path of a pom file
+def _pom(line: str, handlers: List[Handler], low_memory: bool) -> POM:
+    if os.path.isfile(line) or line.endswith('.pom') or line.endswith('.xml'):
+        return POM.from_url('file://' + os.path.abspath(line), url_handlers=handlers, low_memory=low_memory)
+    parts = line.split(':')
+    if len(parts) != 3 or not all(parts):
+        raise POMError('expect group:artifact:version or a pom file, got {}'.format(line))
+    return POM.from_coordinate(*parts, url_handlers=handlers, registry=REGISTRY, low_memory=low_memory)
+
+
+def _items(lines: Iterable[str], done: Set[int]) -> Iterator[Item]:
+    for i, line in enumerate(lines):
+        line = line.strip()
+        if not line or line.startswith('#') or i in done:
+            continue
+        yield i, line
+
+
+# The line numbers already written by a previous run, one per line of the checkpoint
+def read_checkpoint(path: Optional[str]) -> Set[int]:
+    if path is None or not os.path.exists(path):
+        return set()
+    with open(path, 'r') as f:
+        return {int(line) for line in f if line.strip()}
+
+
+# Resolve every line & write one json line per artifact as soon as it is resolved, in no particular order.
+# With a checkpoint, the line number is appended to it once the json line is written,
+# so a run started again skips what is done: an artifact is written at least once, & never missed.
+def run(lines: Iterable[str], out: TextIO, handlers: List[Handler], workers: int = DEFAULT_WORKERS,
+        batch: int = DEFAULT_BATCH, checkpoint: Optional[str] = None, low_memory: bool = False) -> Tuple[int, int]:
+    done = read_checkpoint(checkpoint)
+    journal = open(checkpoint, 'a') if checkpoint is not None else None
+    counts = [0, 0]
+
+    def write(item: Item, record: Dict[str, Any]):
+        out.write(json.dumps(dict(line=item[0] + 1, input=item[1], **record)) + '\n')
+        out.flush()
+        if journal is not None:
+            journal.write('{}\n'.format(item[0]))
+            journal.flush()
+
+    def on_error(item: Item, e: Exception):
+        counts[1] += 1
+        write(item, {'error': str(e)})
+
+    try:
+        items = _items(lines, done)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pom-cli') as pool:
+            while True:
+                chunk = list(islice(items, batch))
+                if not chunk:
+                    break
+                pending = []
+                for item in chunk:
+                    try:
+                        pending.append((item, _pom(item[1], handlers, low_memory)))
+                    except Exception as e:
+                        on_error(item, e)
+                for item, record in _resolve_levels(pending, pool, on_error, getter=_record):
+                    counts[0] += 1
+                    write(item, record)
+    finally:
+        if journal is not None:
+            journal.close()
+    return counts[0], counts[1]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='pom-helper',
+                                     description='Resolve the dependencies of many poms into json lines')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='file of `group:artifact:version` or pom paths, one per line; stdin by default')
+    parser.add_argument('-o', '--output', help='append the json lines to this file rather than stdout')
+    parser.add_argument('-w', '--workers', type=int, default=DEFAULT_WORKERS, help='poms fetched at once')
+    parser.add_argument('--batch', type=int, default=DEFAULT_BATCH, help='lines resolved together')
+    parser.add_argument('--checkpoint', help='file of the lines done, to resume an interrupted run')
+    parser.add_argument('--repository', action='append', default=[],
+                        help='base url of a maven repository tried before central, may be repeated')
+    parser.add_argument('--local-repository', help='a local maven repository tried first, e.g. ~/.m2/repository')
+    parser.add_argument('--local-index', help='index file of the local repository, scanned only when missing')
+    parser.add_argument('--no-central', action='store_true', help='never ask maven central')
+    parser.add_argument('--cache', help='directory of the download cache')
+    parser.add_argument('--low-memory', action='store_true', help='drop the documents once read')
+    parser.add_argument('-q', '--quiet', action='store_true', help='log errors only')
+    args = parser.parse_args(argv)
+    if args.quiet:
+        logging.getLogger().setLevel(logging.ERROR)
+    handlers: List[Handler] = []
+    if args.local_repository:
+        handlers.append(LocalRepository(args.local_repository, index_file=args.local_index))
+    handlers.extend(repository_handler(r) for r in args.repository)
+    if not args.no_central:
+        handlers.extend(DEFAULT_HANDLERS)
+    if args.cache:
+        set_cache(DiskCache(args.cache))
+    lines = sys.stdin if args.input == '-' else open(args.input, 'r')
+    out = sys.stdout if args.output is None else open(args.output, 'a')
+    try:
+        resolved, failed = run(lines, out, handlers, workers=args.workers, batch=args.batch,
+                               checkpoint=args.checkpoint, low_memory=args.low_memory)
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+        if out is not sys.stdout:
+            out.close()
+    if not args.quiet:
+        print('[POM] {} resolved, {} failed'.format(resolved, failed), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
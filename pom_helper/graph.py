@@ -0,0 +1,158 @@
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Tuple, Iterator, Set, Iterable
+
+from .pom_helper import POM, Package, Dependency, Handler, DEFAULT_HANDLERS, is_none
+from .registry import REGISTRY, POMRegistry
+from .resolver import ErrorHandler, log_error, DEFAULT_WORKERS, _resolve_levels
+
+# The scope a transitive dependency gets, by (scope of its dependant, its own scope),
+# a pair which is not here is not inherited
+SCOPES: Dict[Tuple[str, str], str] = {
+    ('compile', 'compile'): 'compile',
+    ('compile', 'runtime'): 'runtime',
+    ('provided', 'compile'): 'provided',
+    ('provided', 'runtime'): 'provided',
+    ('runtime', 'compile'): 'runtime',
+    ('runtime', 'runtime'): 'runtime',
+    ('test', 'compile'): 'test',
+    ('test', 'runtime'): 'test',
+}
+
+# Dependencies with these scopes are never expanded
+TERMINAL_SCOPES = frozenset(['system', 'import'])
+
+Coordinate = Tuple[str, str, str]
+Exclusions = Tuple[Tuple[str, str], ...]
+
+
+def is_excluded(d: Dependency, exclusions: Exclusions) -> bool:
+    for g, a in exclusions:
+        if (g == '*' or g == d.group) and (a == '*' or a == d.artifact):
+            return True
+    return False
+
+
+# The resolved dependencies of an artifact, as a tree of node indexes.
+# The root is the node 0, every other node is the dependency selected for its (group, artifact).
+class DependencyGraph:
+    __slots__ = ('nodes', 'parents', 'depths')
+
+    def __init__(self, root: Package):
+        self.nodes: List[Package] = [root]
+        # index of the dependant of every node, -1 for the root
+        self.parents = array('i', [-1])
+        self.depths = array('H', [0])
+
+    def add(self, node: Dependency, parent: int) -> int:
+        self.nodes.append(node)
+        self.parents.append(parent)
+        self.depths.append(self.depths[parent] + 1)
+        return len(self.nodes) - 1
+
+    @property
+    def root(self) -> Package:
+        return self.nodes[0]
+
+    def dependencies(self) -> List[Dependency]:
+        return self.nodes[1:]
+
+    def edges(self) -> Iterator[Tuple[int, int]]:
+        for i in range(1, len(self.nodes)):
+            yield self.parents[i], i
+
+    def children(self, i: int) -> List[int]:
+        return [j for j in range(i + 1, len(self.nodes)) if self.parents[j] == i]
+
+    # The chain of dependencies from the root down to the node
+    def path(self, i: int) -> List[Package]:
+        path = []
+        while i >= 0:
+            path.append(self.nodes[i])
+            i = self.parents[i]
+        return path[::-1]
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+# Resolve transitive dependencies the way maven does:
+# the nearest declaration of a (group, artifact) wins, scopes are inherited by `SCOPES`,
+# optional transitive dependencies are pruned, and <exclusions> apply to the whole subtree below them.
+# The direct dependencies of every coordinate are computed once & shared by all the graphs of the resolver,
+# each level of the graph is fetched concurrently on a pool of `workers`.
+class TransitiveResolver:
+
+    def __init__(self, url_handlers: List[Handler] = DEFAULT_HANDLERS, registry: POMRegistry = REGISTRY,
+                 scopes: Optional[Iterable[str]] = None, workers: int = DEFAULT_WORKERS, low_memory: bool = False,
+                 on_error: Optional[ErrorHandler] = log_error):
+        self.url_handlers = url_handlers
+        self.registry = registry
+        self.scopes: Optional[Set[str]] = None if is_none(scopes) else set(scopes)
+        self.workers = workers
+        self.low_memory = low_memory
+        self.on_error = on_error
+        # coordinate -> its effective direct dependencies, None if it fails
+        self._direct: Dict[Coordinate, Optional[List[Dependency]]] = {}
+
+    def _pom(self, group: str, artifact: str, version: str) -> POM:
+        return POM.from_coordinate(group, artifact, version, url_handlers=self.url_handlers, registry=self.registry,
+                                   low_memory=self.low_memory)
+
+    def _expand(self, coordinates: List[Coordinate], pool: ThreadPoolExecutor):
+        pending = []
+        for g, a, v in dict.fromkeys(coordinates):
+            if (g, a, v) in self._direct:
+                continue
+            # failures stay None
+            self._direct[(g, a, v)] = None
+            pending.append((Package(group=g, artifact=a, version=v), self._pom(g, a, v)))
+        for package, dependencies in _resolve_levels(pending, pool, self.on_error):
+            self._direct[(package.group, package.artifact, package.version)] = dependencies
+
+    def resolve(self, group: str, artifact: str, version: str) -> DependencyGraph:
+        root = self._pom(group, artifact, version)
+        graph = DependencyGraph(Package(group=group, artifact=artifact, version=version))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pom-graph') as pool:
+            managed = {}
+            for _, v in _resolve_levels([(graph.root, root)], pool, self.on_error,
+                                        getter=POM.get_dependencies_management_index):
+                managed = v
+            self._expand([(group, artifact, version)], pool)
+            direct = self._direct[(group, artifact, version)] or []
+            selected: Dict[Tuple[str, str], int] = {}
+            frontier = [(0, d, ()) for d in direct if is_none(self.scopes) or d.scope in self.scopes]
+            while frontier:
+                expanding = []
+                for parent, d, exclusions in frontier:
+                    # nearest wins, the first of a level wins among the same depth
+                    if (d.group, d.artifact) in selected:
+                        continue
+                    i = graph.add(d, parent)
+                    selected[(d.group, d.artifact)] = i
+                    if not is_none(d.version) and d.scope not in TERMINAL_SCOPES:
+                        expanding.append((i, d, exclusions + d.exclusions))
+                # all the nodes of the level are expanded together
+                self._expand([(d.group, d.artifact, d.version) for _, d, _ in expanding], pool)
+                frontier = []
+                for i, d, exclusions in expanding:
+                    for c in self._direct[(d.group, d.artifact, d.version)] or []:
+                        if c.optional or (c.group, c.artifact) in selected or is_excluded(c, exclusions):
+                            continue
+                        scope = SCOPES.get((d.scope, c.scope))
+                        if is_none(scope) or (not is_none(self.scopes) and scope not in self.scopes):
+                            continue
+                        # the management of the root wins over the versions of the transitive dependencies
+                        m = managed.get((c.group, c.artifact))
+                        version = c.version if is_none(m) or is_none(m.version) else m.version
+                        frontier.append((i, Dependency(group=c.group, artifact=c.artifact, version=version,
+                                                       scope=scope, optional=False, exclusions=c.exclusions),
+                                         exclusions))
+        return graph
+
+
+def resolve_graph(group: str, artifact: str, version: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                  registry: POMRegistry = REGISTRY, scopes: Optional[Iterable[str]] = None,
+                  workers: int = DEFAULT_WORKERS) -> DependencyGraph:
+    return TransitiveResolver(url_handlers=url_handlers, registry=registry, scopes=scopes,
+                              workers=workers).resolve(group, artifact, version)
@@ -0,0 +1,265 @@
+import threading
+import time
+from typing import Dict, List, Optional, Iterable
+
+
+# Told what the library does, every callback is a no-op by default, so a listener overrides what it needs.
+# Poms are named by their coordinate `group:artifact:version`, or by their url when it is not known yet.
+# Callbacks run on the thread doing the work, so they should be quick & thread-safe.
+class Listener:
+    # `enter` & `exit` are only called when it is True, they wrap every lazy getter evaluated
+    tracing = False
+
+    # One request to a repository, `status` is None if it failed without a response.
+    # `size` is the bytes of the body on the wire, before it is decompressed.
+    def downloaded(self, url: str, status: Optional[int], size: int, seconds: float):
+        pass
+
+    def retried(self, url: str, attempt: int, cause: str):
+        pass
+
+    # The content of a pom is obtained, from the file system, the cache or the network; `size` is None if not found
+    def fetched(self, pom: str, size: Optional[int], seconds: float):
+        pass
+
+    # The document of a pom is read, `what` is `model` for `get_model` or `root` for `get_root`
+    def parsed(self, pom: str, what: str, size: int, seconds: float):
+        pass
+
+    # Dependencies are interpolated from the model, `what` is `dependencies` or `management`
+    def extracted(self, pom: str, what: str, count: int, seconds: float):
+        pass
+
+    # The effective dependencies of a pom are known, `depth` is the length of its parent chain
+    def resolved(self, pom: str, depth: int, seconds: float):
+        pass
+
+    def enter(self, pom: str, getter: str):
+        pass
+
+    def exit(self, pom: str, getter: str, seconds: float):
+        pass
+
+
+# Tell several listeners at once
+class Listeners(Listener):
+
+    def __init__(self, listeners: Iterable[Listener]):
+        self.listeners = list(listeners)
+        self.tracing = any(listener.tracing for listener in self.listeners)
+
+    def downloaded(self, url, status, size, seconds):
+        for listener in self.listeners:
+            listener.downloaded(url, status, size, seconds)
+
+    def retried(self, url, attempt, cause):
+        for listener in self.listeners:
+            listener.retried(url, attempt, cause)
+
+    def fetched(self, pom, size, seconds):
+        for listener in self.listeners:
+            listener.fetched(pom, size, seconds)
+
+    def parsed(self, pom, what, size, seconds):
+        for listener in self.listeners:
+            listener.parsed(pom, what, size, seconds)
+
+    def extracted(self, pom, what, count, seconds):
+        for listener in self.listeners:
+            listener.extracted(pom, what, count, seconds)
+
+    def resolved(self, pom, depth, seconds):
+        for listener in self.listeners:
+            listener.resolved(pom, depth, seconds)
+
+    def enter(self, pom, getter):
+        for listener in self.listeners:
+            if listener.tracing:
+                listener.enter(pom, getter)
+
+    def exit(self, pom, getter, seconds):
+        for listener in self.listeners:
+            if listener.tracing:
+                listener.exit(pom, getter, seconds)
+
+
+# Count & time of one kind of event
+class Timer:
+    __slots__ = ('count', 'seconds', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'count': self.count, 'seconds': self.seconds, 'max': self.max}
+
+
+# What is known of a single pom
+class PomMetrics:
+    __slots__ = ('fetch', 'parse', 'extract', 'size', 'depth')
+
+    def __init__(self):
+        self.fetch = 0.0
+        self.parse = 0.0
+        self.extract = 0.0
+        self.size = 0
+        self.depth: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, object]:
+        return {'fetch': self.fetch, 'parse': self.parse, 'extract': self.extract, 'size': self.size,
+                'depth': self.depth}
+
+
+# A metrics registry: totals of every kind of event, & timings per pom
+class Metrics(Listener):
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.timers: Dict[str, Timer] = {}
+            self.counters: Dict[str, int] = {}
+            self.poms: Dict[str, PomMetrics] = {}
+
+    def _time(self, key: str, seconds: float):
+        timer = self.timers.get(key)
+        if timer is None:
+            timer = self.timers[key] = Timer()
+        timer.add(seconds)
+
+    def _count(self, key: str, n: int = 1):
+        self.counters[key] = self.counters.get(key, 0) + n
+
+    def _pom(self, pom: str) -> PomMetrics:
+        v = self.poms.get(pom)
+        if v is None:
+            v = self.poms[pom] = PomMetrics()
+        return v
+
+    def downloaded(self, url, status, size, seconds):
+        with self._lock:
+            self._time('download', seconds)
+            self._count('bytes', size)
+            self._count('status.{}'.format(status))
+
+    def retried(self, url, attempt, cause):
+        with self._lock:
+            self._count('retries')
+
+    def fetched(self, pom, size, seconds):
+        with self._lock:
+            self._time('fetch', seconds)
+            if size is None:
+                self._count('missing')
+            m = self._pom(pom)
+            m.fetch += seconds
+            m.size = size or 0
+
+    def parsed(self, pom, what, size, seconds):
+        with self._lock:
+            self._time('parse.' + what, seconds)
+            self._pom(pom).parse += seconds
+
+    def extracted(self, pom, what, count, seconds):
+        with self._lock:
+            self._time('extract.' + what, seconds)
+            self._count(what, count)
+            self._pom(pom).extract += seconds
+
+    def resolved(self, pom, depth, seconds):
+        with self._lock:
+            self._time('resolve', seconds)
+            self._pom(pom).depth = depth
+
+    # The poms which took the longest, by `fetch`, `parse` or `extract`
+    def slowest(self, n: int = 10, by: str = 'fetch') -> List[str]:
+        with self._lock:
+            return sorted(self.poms, key=lambda p: getattr(self.poms[p], by), reverse=True)[:n]
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {'timers': {k: v.to_dict() for k, v in self.timers.items()}, 'counters': dict(self.counters),
+                    'poms': {k: v.to_dict() for k, v in self.poms.items()}}
+
+
+# A node of a trace, one evaluation of a getter with the ones it needed below it
+class Span:
+    __slots__ = ('pom', 'getter', 'seconds', 'children')
+
+    def __init__(self, pom: str, getter: str):
+        self.pom = pom
+        self.getter = getter
+        self.seconds = 0.0
+        self.children: List[Span] = []
+
+
+# Record the resolution trees: which getter of which pom needed which others, & how long each took.
+# Every thread records its own trees, the finished ones are collected into `roots`.
+class Trace(Listener):
+    tracing = True
+
+    def __init__(self):
+        self.roots: List[Span] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def enter(self, pom, getter):
+        stack = self._stack()
+        span = Span(pom, getter)
+        if stack:
+            stack[-1].children.append(span)
+        stack.append(span)
+
+    def exit(self, pom, getter, seconds):
+        stack = self._stack()
+        span = stack.pop()
+        span.seconds = seconds
+        if not stack:
+            with self._lock:
+                self.roots.append(span)
+
+    def format(self, min_seconds: float = 0.0) -> str:
+        lines = []
+
+        def walk(span: Span, depth: int):
+            if span.seconds < min_seconds:
+                return
+            lines.append('{}{} {} {:.1f}ms'.format('  ' * depth, span.pom, span.getter, span.seconds * 1000))
+            for c in span.children:
+                walk(c, depth + 1)
+
+        for root in list(self.roots):
+            walk(root, 0)
+        return '\n'.join(lines)
+
+
+_listener: Optional[Listener] = None
+
+
+# Set the listener told by every pom, e.g. a `Metrics`, a `Trace`, or `Listeners` of both; None to stop
+def set_listener(listener: Optional[Listener]):
+    global _listener
+    _listener = listener
+
+
+def get_listener() -> Optional[Listener]:
+    return _listener
+
+
+def now() -> float:
+    return time.perf_counter()
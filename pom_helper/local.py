@@ -0,0 +1,138 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Set, Tuple, Optional
+
+DEFAULT_LOCAL_REPOSITORY = os.path.join(os.path.expanduser('~'), '.m2', 'repository')
+INDEX_VERSION = 2
+
+Coordinate = Tuple[str, str, str]
+
+
+# A handler backed by an index of a local maven repository, e.g. ~/.m2/repository or a mirror on disk.
+# The tree is scanned once into a coordinate -> path map, so a lookup never touches the file system,
+# & a coordinate which is not in the index answers None, so that the next handlers are tried at once.
+class LocalRepository:
+
+    def __init__(self, root: str = DEFAULT_LOCAL_REPOSITORY, index_file: Optional[str] = None):
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.index_file = index_file
+        self._poms: Dict[Coordinate, str] = {}
+        # relative directory -> mtime when it was scanned
+        self._dirs: Dict[str, float] = {}
+        # relative directory -> names of its subdirectories, so a directory is never searched for its children
+        self._children: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        if index_file is not None and os.path.exists(index_file):
+            self.load(index_file)
+        else:
+            self.refresh()
+
+    def __call__(self, group: str, artifact: str, version: str) -> Optional[str]:
+        path = self._poms.get((group, artifact, version))
+        if path is None:
+            return None
+        return 'file://' + os.path.join(self.root, path)
+
+    def __len__(self):
+        return len(self._poms)
+
+    def __contains__(self, coordinate: Coordinate):
+        return coordinate in self._poms
+
+    # Scan again the directories changed since the last scan, returns the number of them
+    def refresh(self) -> int:
+        with self._lock:
+            changed = self._scan('')
+        if self.index_file is not None:
+            self.save(self.index_file)
+        return changed
+
+    def _scan(self, rel: str) -> int:
+        path = os.path.join(self.root, rel) if rel else self.root
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            self._forget(rel)
+            if rel:
+                self._children.get(os.path.dirname(rel), set()).discard(os.path.basename(rel))
+            return 0
+        changed = 0
+        if self._dirs.get(rel) != mtime:
+            changed += 1
+            self._dirs[rel] = mtime
+            children = set()
+            pom = None
+            with os.scandir(path) as entries:
+                for e in entries:
+                    if e.is_dir(follow_symlinks=False):
+                        children.add(e.name)
+                    elif e.name.endswith('.pom') and self._is_pom(rel, e.name):
+                        pom = os.path.join(rel, e.name)
+            # replaced in one step once listed, so a lookup meanwhile still finds the pom
+            coordinate = _coordinate(rel)
+            if pom is not None:
+                self._poms[coordinate] = pom
+            elif coordinate is not None:
+                self._poms.pop(coordinate, None)
+            # the directories gone since the last scan
+            for d in self._children.get(rel, set()) - children:
+                self._forget(os.path.join(rel, d) if rel else d)
+            self._children[rel] = children
+        # unchanged or not, its subdirectories may have changed on their own
+        for d in list(self._children.get(rel, ())):
+            changed += self._scan(os.path.join(rel, d) if rel else d)
+        return changed
+
+    # <group as path>/<artifact>/<version>/<artifact>-<version>.pom
+    @staticmethod
+    def _is_pom(rel: str, name: str) -> bool:
+        parts = rel.split(os.sep)
+        return len(parts) >= 3 and name == '{}-{}.pom'.format(parts[-2], parts[-1])
+
+    def _forget(self, rel: str):
+        for d in self._children.pop(rel, ()):
+            self._forget(os.path.join(rel, d) if rel else d)
+        self._dirs.pop(rel, None)
+        coordinate = _coordinate(rel)
+        if coordinate is not None:
+            self._poms.pop(coordinate, None)
+
+    def save(self, index_file: str):
+        with self._lock:
+            index = {'version': INDEX_VERSION, 'root': self.root, 'dirs': self._dirs,
+                     'children': {d: sorted(c) for d, c in self._children.items()},
+                     'poms': [[g, a, v, p] for (g, a, v), p in self._poms.items()]}
+        tmp = '{}.{}.{}.tmp'.format(index_file, os.getpid(), threading.get_ident())
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, index_file)
+
+    def load(self, index_file: str):
+        try:
+            with open(index_file, 'r') as f:
+                index = json.load(f)
+            # an index of another version or repository is scanned again
+            if index.get('version') != INDEX_VERSION or index.get('root') != self.root:
+                self.refresh()
+                return
+            dirs = index['dirs']
+            children = {d: set(c) for d, c in index['children'].items()}
+            poms = {(g, a, v): p for g, a, v, p in index['poms']}
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            logging.error('[POM] index {} is corrupt, scan again: {}'.format(index_file, e))
+            self.refresh()
+            return
+        with self._lock:
+            self._dirs = dirs
+            self._children = children
+            self._poms = poms
+
+
+# The coordinate a directory of the repository holds the pom of, None if it is too shallow
+def _coordinate(rel: str) -> Optional[Coordinate]:
+    parts = rel.split(os.sep)
+    if len(parts) < 3:
+        return None
+    return '.'.join(parts[:-2]), parts[-2], parts[-1]
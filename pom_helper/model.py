@@ -0,0 +1,232 @@
+from io import BytesIO
+from typing import List, Optional, Dict, Union, Tuple
+
+from lxml import etree
+
+TAG_PROJECT_GROUP = ('groupId',)
+TAG_PROJECT_ARTIFACT = ('artifactId',)
+TAG_PROJECT_VERSION = ('version',)
+TAG_PROJECT_PARENT = ('parent',)
+TAG_PROJECT_PROPERTIES = ('properties',)
+TAG_PROJECT_DEPENDENCY = ('dependencies', 'dependency')
+TAG_PROJECT_MANAGED_DEPENDENCY = ('dependencyManagement', 'dependencies', 'dependency')
+TAG_PROJECT_PROFILE = ('profiles', 'profile')
+TAG_PROJECT_MODULE = ('modules', 'module')
+TAG_PROFILE_ID = ('id',)
+# Elements read as a whole, so they can be dropped at once
+DROP_AFTER_READ = frozenset(['dependency', 'profile'])
+
+
+# The raw text of a <dependency>, before any ${XXX} is interpolated
+class DependencyModel:
+    __slots__ = ('group', 'artifact', 'version', 'scope', 'optional', 'exclusions')
+
+    def __init__(self, group: Optional[str] = None, artifact: Optional[str] = None, version: Optional[str] = None,
+                 scope: Optional[str] = None, optional: Optional[str] = None,
+                 exclusions: Tuple[Tuple[Optional[str], Optional[str]], ...] = ()):
+        self.group = group
+        self.artifact = artifact
+        self.version = version
+        self.scope = scope
+        self.optional = optional
+        # (groupId, artifactId) of <exclusions>
+        self.exclusions = exclusions
+
+
+# Where a parent is looked for on disk when <relativePath> is not given
+DEFAULT_RELATIVE_PATH = '../pom.xml'
+
+
+class ParentModel:
+    __slots__ = ('group', 'artifact', 'version', 'relative_path')
+
+    def __init__(self, group: Optional[str] = None, artifact: Optional[str] = None, version: Optional[str] = None,
+                 relative_path: Optional[str] = DEFAULT_RELATIVE_PATH):
+        self.group = group
+        self.artifact = artifact
+        self.version = version
+        # None for an empty <relativePath/>, the parent is never looked for on disk then
+        self.relative_path = relative_path
+
+
+# What the getters of a `POM` read from the document, and nothing else
+class POMModel:
+    __slots__ = ('group', 'artifact', 'version', 'parent', 'properties', 'dependencies', 'management', 'profiles',
+                 'modules')
+
+    def __init__(self):
+        self.group: Optional[str] = None
+        self.artifact: Optional[str] = None
+        self.version: Optional[str] = None
+        self.parent: Optional[ParentModel] = None
+        # None if there is no <properties>
+        self.properties: Optional[Dict[str, Optional[str]]] = None
+        self.dependencies: List[DependencyModel] = []
+        self.management: List[DependencyModel] = []
+        self.profiles: List[ProfileModel] = []
+        # the paths of <modules>, relative to the pom
+        self.modules: List[str] = []
+
+
+# The raw text of <activation>
+class ActivationModel:
+    __slots__ = ('active_by_default', 'jdk', 'os_name', 'os_family', 'os_arch', 'os_version', 'property_name',
+                 'property_value', 'file_exists', 'file_missing')
+
+    def __init__(self):
+        self.active_by_default: Optional[str] = None
+        self.jdk: Optional[str] = None
+        self.os_name: Optional[str] = None
+        self.os_family: Optional[str] = None
+        self.os_arch: Optional[str] = None
+        self.os_version: Optional[str] = None
+        self.property_name: Optional[str] = None
+        self.property_value: Optional[str] = None
+        self.file_exists: Optional[str] = None
+        self.file_missing: Optional[str] = None
+
+
+# A <profile> is read like a little pom of its own
+class ProfileModel(POMModel):
+    __slots__ = ('id', 'activation')
+
+    def __init__(self):
+        super().__init__()
+        self.id: Optional[str] = None
+        self.activation: Optional[ActivationModel] = None
+
+
+# <activation> path -> field of `ActivationModel`
+ACTIVATION_FIELDS = {
+    ('activation', 'activeByDefault'): 'active_by_default',
+    ('activation', 'jdk'): 'jdk',
+    ('activation', 'os', 'name'): 'os_name',
+    ('activation', 'os', 'family'): 'os_family',
+    ('activation', 'os', 'arch'): 'os_arch',
+    ('activation', 'os', 'version'): 'os_version',
+    ('activation', 'property', 'name'): 'property_name',
+    ('activation', 'property', 'value'): 'property_value',
+    ('activation', 'file', 'exists'): 'file_exists',
+    ('activation', 'file', 'missing'): 'file_missing',
+}
+
+
+# The model of a pom with its active profiles merged in, like maven injects them before interpolation:
+# their properties override the pom's, & their dependencies win over the pom's of the same (group, artifact)
+def merge_profiles(model: POMModel, profiles: List[ProfileModel]) -> POMModel:
+    merged = POMModel()
+    merged.group = model.group
+    merged.artifact = model.artifact
+    merged.version = model.version
+    merged.parent = model.parent
+    merged.dependencies = []
+    merged.management = []
+    # the later profile wins, the first one of a (group, artifact) is kept by the getters
+    for p in reversed(profiles):
+        merged.dependencies.extend(p.dependencies)
+        merged.management.extend(p.management)
+    merged.dependencies.extend(model.dependencies)
+    merged.management.extend(model.management)
+    merged.modules = model.modules + [m for p in profiles for m in p.modules]
+    for p in [model] + profiles:
+        if p.properties is not None:
+            merged.properties = dict(merged.properties or {}, **p.properties)
+    return merged
+
+
+def _local(tag) -> str:
+    if not isinstance(tag, str):
+        return ''
+    i = tag.rfind('}')
+    return tag[i + 1:] if i >= 0 else tag
+
+
+def _children(el) -> Dict[str, Optional[str]]:
+    # like `find`, the first one of a tag wins
+    v = {}
+    for c in el:
+        v.setdefault(_local(c.tag), c.text)
+    return v
+
+
+def _dependency(el) -> DependencyModel:
+    v = _children(el)
+    exclusions = []
+    for c in el:
+        if _local(c.tag) == 'exclusions':
+            for e in c:
+                ex = _children(e)
+                exclusions.append((ex.get('groupId'), ex.get('artifactId')))
+    return DependencyModel(group=v.get('groupId'), artifact=v.get('artifactId'), version=v.get('version'),
+                           scope=v.get('scope'), optional=v.get('optional'), exclusions=tuple(exclusions))
+
+
+# Read the document incrementally into a `POMModel`.
+# Every element is dropped once it is read, so the whole tree never stays in memory.
+def parse_model(plain: Union[bytes, str]) -> POMModel:
+    if isinstance(plain, str):
+        plain = plain.encode('UTF-8')
+    # TODO: delete invalid prefix
+    plain = plain[plain.find(b'<'):]
+    model = POMModel()
+    profile: Optional[ProfileModel] = None
+    path = []
+    for event, el in etree.iterparse(BytesIO(plain), events=('start', 'end'), remove_comments=True,
+                                     remove_pis=True, recover=True):
+        if event == 'start':
+            path.append(_local(el.tag))
+            tags = tuple(path[1:])
+            if tags == TAG_PROJECT_PROFILE:
+                profile = ProfileModel()
+            # an empty <properties> still has properties
+            elif tags == TAG_PROJECT_PROPERTIES:
+                model.properties = {}
+            elif profile is not None and tags[2:] == TAG_PROJECT_PROPERTIES:
+                profile.properties = {}
+            continue
+        tags = tuple(path[1:])
+        path.pop()
+        if tags == TAG_PROJECT_PROFILE:
+            model.profiles.append(profile)
+            profile = None
+        elif profile is not None and tags[:2] == TAG_PROJECT_PROFILE:
+            _take(profile, tags[2:], el)
+        else:
+            _take(model, tags, el)
+        # nothing but the model is kept, drop what is read
+        if len(tags) <= 1 or tags[-1] in DROP_AFTER_READ:
+            el.clear()
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+    return model
+
+
+def _take(model: POMModel, tags: tuple, el):
+    if tags == TAG_PROJECT_DEPENDENCY:
+        model.dependencies.append(_dependency(el))
+    elif tags == TAG_PROJECT_MANAGED_DEPENDENCY:
+        model.management.append(_dependency(el))
+    elif len(tags) == 2 and tags[0] == TAG_PROJECT_PROPERTIES[0]:
+        model.properties[tags[1]] = el.text
+    elif tags == TAG_PROJECT_PARENT:
+        v = _children(el)
+        model.parent = ParentModel(group=v.get('groupId'), artifact=v.get('artifactId'), version=v.get('version'),
+                                   relative_path=v.get('relativePath', DEFAULT_RELATIVE_PATH))
+    elif tags == TAG_PROJECT_MODULE:
+        model.modules.append(el.text)
+    elif tags == TAG_PROJECT_GROUP:
+        model.group = el.text
+    elif tags == TAG_PROJECT_ARTIFACT:
+        model.artifact = el.text
+    elif tags == TAG_PROJECT_VERSION:
+        model.version = el.text
+    elif isinstance(model, ProfileModel):
+        if tags == TAG_PROFILE_ID:
+            model.id = el.text
+        elif tags in ACTIVATION_FIELDS:
+            if model.activation is None:
+                model.activation = ActivationModel()
+            setattr(model.activation, ACTIVATION_FIELDS[tags], el.text)
+        # an empty <activation/> still is one
+        elif tags == ('activation',) and model.activation is None:
+            model.activation = ActivationModel()
@@ -1,15 +1,26 @@
+import functools
 import logging
-import os.path
 import re
-import time
-from typing import List, Union, Optional, Callable, Final, Dict
+import sys
+import threading
+from contextlib import contextmanager
+from typing import List, Union, Optional, Callable, Final, Dict, Tuple, Iterable
 
-import requests
+import attr
 from attr import dataclass
 from lxml import etree
 
-# A function which should accept 'group', 'artifact' & 'version' and return the content of the pom
-Handler = Callable[[str, str, str], str]
+from .cache import DiskCache, get_cache, policy_ttl
+from .instrument import Listener, get_listener, now
+from .model import POMModel, DependencyModel, ProfileModel, parse_model, merge_profiles
+from .profiles import ActivationContext, is_active, is_active_by_default
+from .registry import REGISTRY, POMRegistry
+from .routing import ROUTES, RouteStats, is_race, get_executor
+from .transport import HTTPTransport, TransportError, TransportCancelled, Response, get_transport
+
+# A function which should accept 'group', 'artifact' & 'version' and return the url of the pom,
+# or None if it knows there is no such pom
+Handler = Callable[[str, str, str], Optional[str]]
 
 
 # Default implement of the hanlder
@@ -39,6 +50,13 @@ TAG_PROFILE = "profile"
 TAG_PROFILE_ID = "id"
 
 UNDEFINED = "$undefined"
+# The document is dropped once read in low-memory mode
+DISCARDED = "$discarded"
+# The load of a pom has failed: the next getter raises, & the one after asks the repositories again
+FAILED = "$failed"
+
+# ${XXX}
+RE_REF: Final[re.Pattern] = re.compile('\\$\\{(.*?)\\}')
 
 
 class POMError(Exception):
@@ -53,6 +71,34 @@ class POMError(Exception):
 ERR_INVALID = POMError('invalid constructor parameter')
 
 
+# The pom has to be downloaded, but fetching is deferred to the caller, see `deferred_fetch`
+class POMMissing(POMError):
+    def __init__(self, pom, urls: List[str], group: Optional[str]):
+        super().__init__('pom is not loaded yet')
+        self.pom = pom
+        self.urls = urls
+        self.group = group
+
+
+_deferred = threading.local()
+
+
+# Inside the context, a pom which is not loaded yet raises `POMMissing` instead of being fetched,
+# so that the caller can collect & fetch them together
+@contextmanager
+def deferred_fetch():
+    previous = getattr(_deferred, 'enabled', False)
+    _deferred.enabled = True
+    try:
+        yield
+    finally:
+        _deferred.enabled = previous
+
+
+def is_fetch_deferred() -> bool:
+    return getattr(_deferred, 'enabled', False)
+
+
 # Fail to indentify the key attribute in the pom
 def fail_to_identity(e):
     raise POMError('cannot identify {}'.format(e))
@@ -70,17 +116,54 @@ def is_valid(v):
     return not is_undefined(v) and not is_none(v)
 
 
-@dataclass(hash=True, eq=True)
+# Memoize a getter into `field`.
+# The first caller evaluates it under the pom's lock, the concurrent callers wait for it & share the result,
+# so a pom shared between threads is fetched & parsed once, and nobody sees it half-initialized.
+def lazy(field: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self):
+            v = getattr(self, field)
+            if not is_undefined(v):
+                return v
+            with self._lock:
+                listener = get_listener()
+                if is_none(listener) or not listener.tracing:
+                    return fn(self)
+                return _traced(listener, self, fn, field)
+
+        return wrapper
+
+    return decorator
+
+
+def _traced(listener: Listener, pom, fn, field: str):
+    v = getattr(pom, field)
+    if not is_undefined(v):
+        return v
+    name = pom.name()
+    listener.enter(name, fn.__name__)
+    start = now()
+    try:
+        return fn(pom)
+    finally:
+        listener.exit(name, fn.__name__, now() - start)
+
+
+# Slotted, millions of them are held across a big scan
+@dataclass(hash=True, eq=True, slots=True)
 class Package:
     artifact: str
     group: str
     version: str
 
 
-@dataclass(hash=True, eq=True)
+@dataclass(hash=True, eq=True, slots=True)
 class Dependency(Package):
     scope: str
     optional: bool
+    # (group, artifact) excluded from its transitive dependencies, `*` matches any
+    exclusions: Tuple[Tuple[str, str], ...] = attr.ib(default=(), eq=False)
 
 
 class POM:
@@ -93,14 +176,26 @@ class POM:
         self._version: Union[str, None] = UNDEFINED
         self._dependencies: Union[List[Dependency], str, None] = UNDEFINED
         self._dependencies_management: Union[List[Dependency], str, None] = UNDEFINED
+        self._dependencies_management_index: Union[Dict[Tuple[str, str], Dependency], str, None] = UNDEFINED
         self._properties: Union[Dict[str, str], str, None] = UNDEFINED
-        self._profiles: Union[Dict[str, POM], str, None] = UNDEFINED
+        self._profiles: Union[Dict[str, Profile], str, None] = UNDEFINED
+        # (active profile ids, parent with its own active profiles) -> the pom with them merged, see `activate`
+        self._activated: Dict[Tuple[Tuple[str, ...], Optional[POM]], POM] = {}
         self._parent: Union[POM, str, None] = UNDEFINED
-        self._plain: Union[str, None] = UNDEFINED
+        self._plain: Union[bytes, str, None] = UNDEFINED
+        self._model: Union[POMModel, str] = UNDEFINED
+        self._low_memory = False
         self._urls: Union[List[str], str, None] = UNDEFINED
+        # when the document was fetched, to tell when the registry should fetch it again
+        self._fetched_at: Optional[float] = None
         self._url_handlers: Union[Handler, str, None] = UNDEFINED
+        self._registry: POMRegistry = REGISTRY
+        self._lock = threading.RLock()
         self._re_namespace: Final[re.Pattern] = re.compile('({.*?})')
-        self._re_ref: Final[re.Pattern] = re.compile('(\\${.*?})')
+        self._effective_properties: Union[Dict[str, str], str] = UNDEFINED
+        # ${XXX} already interpolated, & the ones being interpolated to detect cycles
+        self._resolved: Dict[str, str] = {}
+        self._resolving = set()
 
     def iter(self, node, tag):
         return node.iter(self._namespace + tag)
@@ -123,38 +218,96 @@ class POM:
             return default
         return v
 
+    @lazy('_root')
     def get_root(self):
         if not is_undefined(self._root):
             return self._root
-        # build root from plain text
-        if not is_undefined(self._plain):
-            if is_none(self._plain):
-                raise ERR_INVALID
-            # TODO: delete invalid prefix
-            self._plain = self._plain[self._plain.find('<'):]
-            self._root = etree.fromstring(self._plain.encode('UTF-8'),
-                                          parser=etree.XMLParser(remove_comments=True, remove_pis=True, recover=True))
-            try:
-                self._namespace = self._re_namespace.search(self._root.tag).group(1)
-            except AttributeError:
-                self._namespace = ''
-            return self._root
-        # build plain from urls, and do again
-        if is_valid(self._urls):
-            self._plain = fetch(self._urls)
-            return self.get_root()
-        # build url from coordinate, and do again
-        if is_valid(self._group) and is_valid(self._artifact) and is_valid(self._version):
-            self._urls = list(map(lambda h: h(self._group, self._artifact, self._version), self._url_handlers))
-            return self.get_root()
-        raise ERR_INVALID
-
+        plain = self._get_plain()
+        if plain == DISCARDED:
+            raise POMError('the document is dropped in low-memory mode')
+        if isinstance(plain, str):
+            plain = plain.encode('UTF-8')
+        # TODO: delete invalid prefix
+        plain = plain[plain.find(b'<'):]
+        start = now()
+        root = etree.fromstring(plain, parser=etree.XMLParser(remove_comments=True, remove_pis=True, recover=True))
+        listener = get_listener()
+        if not is_none(listener):
+            listener.parsed(self.name(), 'root', len(plain), now() - start)
+        try:
+            self._namespace = self._re_namespace.search(root.tag).group(1)
+        except AttributeError:
+            self._namespace = ''
+        # publish the root at last, it is what the others check
+        self._root = root
+        return self._root
+
+    # What the getters read from the document, see `parse_model`
+    @lazy('_model')
+    def get_model(self) -> POMModel:
+        if not is_undefined(self._model):
+            return self._model
+        plain = self._get_plain()
+        start = now()
+        model = parse_model(plain)
+        listener = get_listener()
+        if not is_none(listener):
+            listener.parsed(self.name(), 'model', len(plain), now() - start)
+        if self._low_memory:
+            self._plain = DISCARDED
+        self._model = model
+        return self._model
+
+    def _get_plain(self) -> Union[bytes, str]:
+        with self._lock:
+            if not is_undefined(self._plain):
+                if self._plain == FAILED:
+                    self._plain = UNDEFINED
+                    raise self._not_found()
+                if is_none(self._plain):
+                    raise ERR_INVALID
+                return self._plain
+            # build plain from urls
+            if is_valid(self._urls):
+                if is_fetch_deferred():
+                    raise POMMissing(self, self._urls, self._group if is_valid(self._group) else None)
+                start = now()
+                plain = fetch_bytes(self._urls, group=self._group if is_valid(self._group) else None)
+                listener = get_listener()
+                if not is_none(listener):
+                    listener.fetched(self.name(), None if is_none(plain) else len(plain), now() - start)
+                # a failure is not memoized, a pom shared by the registry would fail until evicted
+                # though its repository is back
+                if is_none(plain):
+                    raise self._not_found()
+                self._plain = plain
+                self._fetched_at = now()
+                return self._plain
+            # build url from coordinate, and do again
+            if is_valid(self._group) and is_valid(self._artifact) and is_valid(self._version):
+                # a handler answers None if it knows it has no such pom
+                self._urls = [u for u in map(lambda h: h(self._group, self._artifact, self._version),
+                                             self._url_handlers) if not is_none(u)]
+                return self._get_plain()
+            raise ERR_INVALID
+
+    def _not_found(self) -> POMError:
+        return POMError('{} is not found in {}'.format(self.name(), ', '.join(self._urls) or 'any repository'))
+
+    # Take the content fetched by the caller of `deferred_fetch`, None if it failed
+    def load(self, plain: Union[bytes, str, None]):
+        with self._lock:
+            if is_undefined(self._plain):
+                self._plain = FAILED if is_none(plain) else plain
+                if not is_none(plain):
+                    self._fetched_at = now()
+
+    @lazy('_group')
     def get_group_id(self):
         if not is_undefined(self._group):
             return self._group
-        root = self.get_root()
         # search <groupId>
-        v = self.value(root, TAG_GROUP)
+        v = self.get_model().group
         if is_none(v):
             parent = self.get_parent()
             if is_none(parent):
@@ -163,23 +316,23 @@ class POM:
         self._group = v
         return v
 
+    @lazy('_artifact')
     def get_artifact(self):
         if not is_undefined(self._artifact):
             return self._artifact
-        root = self.get_root()
         # search <artifact>
-        v = self.value(root, TAG_ARTIFACT)
+        v = self.get_model().artifact
         if is_none(v):
             fail_to_identity(TAG_ARTIFACT)
         self._artifact = v
         return v
 
+    @lazy('_version')
     def get_version(self):
         if not is_undefined(self._version):
             return self._version
-        root = self.get_root()
         # search <version>
-        v = self.value(root, TAG_VERSION)
+        v = self.get_model().version
         # if version is none, use parent's version
         if is_none(v):
             parent = self.get_parent()
@@ -191,223 +344,601 @@ class POM:
         self._version = v
         return v
 
+    @lazy('_dependencies')
     def get_dependencies(self):
         if not is_undefined(self._dependencies):
             return self._dependencies
+        start = now()
         dependencies = {}
-        root = self.get_root()
         # search <dependencies>
-        deps = self.search(root, TAG_DEPENDENCIES)
-        if not is_none(deps):
-            for d in self._extract_dependencies(deps):
-                dependencies.setdefault((d.group, d.artifact), d)
+        for d in self._extract('dependencies', self.get_model().dependencies):
+            dependencies.setdefault((d.group, d.artifact), d)
         # add parent's dependencies, ignore redundant
         if not is_none(self.get_parent()):
             for d in self.get_parent().get_dependencies():
                 dependencies.setdefault((d.group, d.artifact), d)
         self._dependencies = list(dependencies.values())
+        listener = get_listener()
+        if not is_none(listener):
+            listener.resolved(self.name(), self.depth(), now() - start)
         return self._dependencies
 
+    @lazy('_dependencies_management')
     def get_dependencies_management(self):
         if not is_undefined(self._dependencies_management):
             return self._dependencies_management
+        self._dependencies_management = list(self.get_dependencies_management_index().values())
+        return self._dependencies_management
+
+    # The effective dependencyManagement, merged once across the parents & imported boms, keyed by (group, artifact)
+    @lazy('_dependencies_management_index')
+    def get_dependencies_management_index(self):
+        if not is_undefined(self._dependencies_management_index):
+            return self._dependencies_management_index
         dependencies_management = {}
-        root = self.get_root()
-        # search <dependencyManagement>
-        deps_manage = self.search(root, TAG_DEPENDENCIES_MANAGE)
-        if not is_none(deps_manage):
-            # search <dependencyManagement.dependencies>
-            deps = self.search(deps_manage, TAG_DEPENDENCIES)
-            if not is_none(deps):
-                for d in self._extract_dependencies(deps, is_manage=True):
-                    dependencies_management.setdefault((d.group, d.artifact), d)
+        # search <dependencyManagement.dependencies>
+        for d in self._extract('management', self.get_model().management, is_manage=True):
+            dependencies_management.setdefault((d.group, d.artifact), d)
         # add parent's dependencies_management, ignore redundant
         if not is_none(self.get_parent()):
-            for d in self.get_parent().get_dependencies_management():
-                dependencies_management.setdefault((d.group, d.artifact), d)
-        self._dependencies_management = list(dependencies_management.values())
-        return self._dependencies_management
-
+            for k, d in self.get_parent().get_dependencies_management_index().items():
+                dependencies_management.setdefault(k, d)
+        self._dependencies_management_index = dependencies_management
+        return self._dependencies_management_index
+
+    def _managed_version(self, group: str, artifact: str) -> Optional[str]:
+        s = self
+        while not is_none(s):
+            d = s.get_dependencies_management_index().get((group, artifact))
+            # the parents are merged in, so none of them manages it
+            if is_none(d):
+                return None
+            if not is_none(d.version):
+                return d.version
+            # managed without version, the parents may give it
+            s = s.get_parent()
+        return None
+
+    @lazy('_profiles')
     def get_profiles(self):
         if not is_undefined(self._profiles):
             return self._profiles
-        root = self.get_root()
-        # search <profiles>
-        profiles = self.search(root, TAG_PROFILES)
-        if is_none(profiles):
+        # search <profiles.profile>
+        profiles = self.get_model().profiles
+        if not profiles:
             self._profiles = None
             return None
-        # search <profiles.profile>
-        self._profiles = {}
-        for profile in self.iter(profiles, TAG_PROFILE):
-            pid = self.value(profile, TAG_PROFILE_ID)
-            pom = self.from_coordinate(group=self.get_group_id(), artifact=self.get_artifact(),
-                                       version=self.get_version(), url_handlers=self._url_handlers)
-            pom._plain = etree.tostring(profile).decode()
-            pom._parent = pom.get_parent()
-            if is_none(pom.get_properties()):
-                pom._properties = self.get_properties()
-            else:
-                pom._properties = pom.get_properties().update(self.get_properties())
-            self._profiles[pid] = pom
+        # profiles are views of this pom's model, nothing is parsed or fetched again
+        self._profiles = {profile.id: Profile(self, profile) for profile in profiles}
         return self._profiles
 
+    # The ids of the profiles maven would activate: the ones in `profiles`, or whose <activation> holds in `context`,
+    # or else the <activeByDefault> ones. `!id` deactivates a profile whatever its activation is.
+    def get_active_profiles(self, profiles: Optional[Iterable[str]] = None,
+                            context: Optional[ActivationContext] = None) -> List[str]:
+        profiles = list(profiles or ())
+        explicit = {p for p in profiles if not p.startswith('!')}
+        inactive = {p[1:] for p in profiles if p.startswith('!')}
+        models = self.get_model().profiles
+        active = [p.id for p in models
+                  if p.id in explicit or (not is_none(context) and is_active(p.activation, context))]
+        # <activeByDefault> gives way to any other active profile of the same pom
+        if not active:
+            active = [p.id for p in models if is_active_by_default(p.activation)]
+        return [i for i in active if i not in inactive]
+
+    # This pom with its active profiles merged in, see `get_active_profiles`.
+    # The parents activate their own profiles against the same ids & context, like a maven build does.
+    def activate(self, profiles: Optional[Iterable[str]] = None, context: Optional[ActivationContext] = None) -> 'POM':
+        profiles = list(profiles or ())
+        ids = tuple(self.get_active_profiles(profiles, context))
+        parent = self.get_parent()
+        if not is_none(parent):
+            parent = parent.activate(profiles, context)
+        with self._lock:
+            key = (ids, parent)
+            pom = self._activated.get(key)
+            if not is_none(pom):
+                return pom
+            if not ids and parent is self.get_parent():
+                pom = self
+            else:
+                models = {p.id: p for p in self.get_model().profiles}
+                pom = POM()
+                pom._model = merge_profiles(self.get_model(), [models[i] for i in ids])
+                pom._plain = DISCARDED
+                pom._parent = parent
+                pom._url_handlers = self._url_handlers
+                pom._registry = self._registry
+                pom._low_memory = self._low_memory
+            self._activated[key] = pom
+            return pom
+
+    # The dependencies with the active profiles merged in, see `activate`
+    def get_effective_dependencies(self, profiles: Optional[Iterable[str]] = None,
+                                   context: Optional[ActivationContext] = None) -> List[Dependency]:
+        return self.activate(profiles, context).get_dependencies()
+
     def _check_ref(self, field: str) -> str:
         # TODO: if field is blank, it may be switched by profile
         if not field:
             return ''
+        if '${' not in field:
+            return field
         # may be ${xxx}-${yyy}
-        refs = self._re_ref.findall(field)
-        for r in refs:
-            key = v = r[2:-1]
-            s = self
-            # if not found, search in parent's properties
-            while not is_none(s):
-                # if ${project.version}, use project's version
-                if key == 'project.version':
-                    v = s.get_version()
-                    break
-                # if ${project.parent.version}, use project's parent's version
-                if key == 'project.parent.version':
-                    # TODO: but if there is no parent,
-                    if is_none(s.get_parent()):
-                        v = 'None'
-                        break
-                    v = s.get_parent().get_version()
-                    break
-                properties = s.get_properties()
-                # if <XXX> = ${XXX}, search its parent
-                if not is_none(properties) and key in properties and properties[key] != r:
-                    v = properties[key]
-                    break
-                s = s.get_parent()
-            # not found, there must be an error
-            if v == key:
+        with self._lock:
+            return RE_REF.sub(lambda m: self._resolve_ref(m.group(1)), field)
+
+    def _resolve_ref(self, key: str) -> str:
+        v = self._resolved.get(key)
+        if not is_none(v):
+            return v
+        if key in self._resolving:
+            raise POMError('cyclic reference ${{{}}}'.format(key))
+        self._resolving.add(key)
+        try:
+            builtin = BUILTIN_PROPERTIES.get(key)
+            if not is_none(builtin):
+                v = builtin(self)
+            else:
+                properties = self.get_effective_properties()
+                # not found, there must be an error
+                if key not in properties:
+                    fail_to_identity('ref')
+                # it may still be ${XXX} or ${project.version}, so check again
+                v = self._check_ref(properties[key])
+        finally:
+            self._resolving.discard(key)
+        self._resolved[key] = v
+        return v
+
+    # Parent's coordinate can only refer to the pom's own properties, the inherited ones depend on the parent
+    def _check_local_ref(self, field: str, resolving: frozenset = frozenset()) -> str:
+        if not field:
+            return ''
+        if '${' not in field:
+            return field
+        properties = self.get_properties() or {}
+
+        def resolve(m):
+            key = m.group(1)
+            if key in resolving or key not in properties:
                 fail_to_identity('ref')
-            # it should get, but may still be ${XXX} or ${project.version}, so check again
-            v = self._check_ref(v)
-            field = field.replace(r, v)
-        return field
+            return self._check_local_ref(properties[key], resolving | {key})
+
+        return RE_REF.sub(resolve, field)
+
+    # `_extract_dependencies`, told to the listener
+    def _extract(self, what: str, deps: List[DependencyModel], is_manage=False) -> List[Dependency]:
+        listener = get_listener()
+        if is_none(listener):
+            return self._extract_dependencies(deps, is_manage)
+        start = now()
+        dependencies = self._extract_dependencies(deps, is_manage)
+        listener.extracted(self.name(), what, len(dependencies), now() - start)
+        return dependencies
 
-    def _extract_dependencies(self, deps, is_manage=False) -> List[Dependency]:
+    def _extract_dependencies(self, deps: List[DependencyModel], is_manage=False) -> List[Dependency]:
         dependencies = []
-        for dep in self.iter(deps, TAG_DEPENDENCY):
+        for dep in deps:
             # get artifact
-            artifact = self.value(dep, TAG_ARTIFACT)
-            artifact = self._check_ref(artifact)
+            artifact = self._check_ref(dep.artifact)
             # if artifact is `unspecified`, skip
             if artifact == 'unspecified':
                 continue
             # get group
-            group = self.value(dep, TAG_GROUP)
-            if group == '${project.groupId}':
-                group = self.get_group_id()
-            group = self._check_ref(group)
+            group = self._check_ref(dep.group)
             # get version
-            version = self.value(dep, TAG_VERSION)
+            version = dep.version
             # get scope & optional
-            scope = self.value_or_default(dep, TAG_SCOPE, default='compile')
-            optional = bool(self.value_or_default(dep, TAG_OPTIONAL, default=False))
+            scope = dep.scope if not is_none(dep.scope) else 'compile'
+            optional = not is_none(dep.optional) and dep.optional.strip() == 'true'
+            exclusions = tuple((self._check_ref(g), self._check_ref(a)) for g, a in dep.exclusions)
             # version is ${XXX} search in properties
             if not is_none(version):
                 version = self._check_ref(version)
             # version is none, search in self and parent's management
             if is_none(version) and not is_manage:
-                s = self
-                while not is_none(s) and is_none(version):
-                    pdeps = s.get_dependencies_management()
-                    s = s.get_parent()
-                    if is_none(pdeps):
-                        continue
-                    try:
-                        version = next(d for d in pdeps if group == d.group and artifact == d.artifact).version
-                    except StopIteration:
-                        continue
+                version = self._managed_version(group, artifact)
             # while parsing dependencyManagement,
             # scope `import` means importing extra dependencyManagement from target pom
             if is_manage and scope == 'import':
                 target = self.from_coordinate(artifact=artifact, group=group, version=version,
-                                              url_handlers=self._url_handlers)
-                deps = target.get_dependencies_management()
-                if not is_none(deps):
-                    dependencies.extend(deps)
-            dependencies.append(
-                Dependency(group=group, artifact=artifact, version=version, scope=scope, optional=optional))
+                                              url_handlers=self._url_handlers, registry=self._registry,
+                                              low_memory=self._low_memory)
+                dependencies.extend(target.get_dependencies_management_index().values())
+            # the same coordinates & scopes come again & again across poms, keep one copy of each
+            dependencies.append(Dependency(group=_intern(group), artifact=_intern(artifact), version=_intern(version),
+                                           scope=_intern(scope), optional=optional, exclusions=exclusions))
         return dependencies
 
+    @lazy('_properties')
     def get_properties(self):
         if not is_undefined(self._properties):
             return self._properties
-        root = self.get_root()
-        v = self.search(root, TAG_PROPERTIES)
-        self._properties = v
-        if not is_none(v):
-            self._properties = {}
-            for p in v:
-                self._properties[p.tag[len(self._namespace):]] = p.text
+        # search <properties>
+        self._properties = self.get_model().properties
         return self._properties
 
+    # The properties inherited from the parents, overridden by the pom's own ones
+    @lazy('_effective_properties')
+    def get_effective_properties(self):
+        if not is_undefined(self._effective_properties):
+            return self._effective_properties
+        properties = {}
+        parent = self.get_parent()
+        if not is_none(parent):
+            properties.update(parent.get_effective_properties())
+        own = self.get_properties()
+        if not is_none(own):
+            for k, v in own.items():
+                # if <XXX> = ${XXX}, keep its parent's
+                if v == '${' + k + '}':
+                    continue
+                properties[k] = v
+        self._effective_properties = properties
+        return self._effective_properties
+
+    @lazy('_parent')
     def get_parent(self):
         if not is_undefined(self._parent):
             return self._parent
-        root = self.get_root()
-        parent = self.search(root, TAG_PARENT)
+        # search <parent>
+        parent = self.get_model().parent
         if is_none(parent):
             self._parent = None
             return self._parent
-        group = self.value(parent, TAG_GROUP)
-        artifact = self.value(parent, TAG_ARTIFACT)
-        version = self.value(parent, TAG_VERSION)
-        version = self._check_ref(version)
+        group = parent.group
+        artifact = parent.artifact
+        version = self._check_local_ref(parent.version)
         self._parent = self.from_coordinate(artifact=artifact, group=group, version=version,
-                                            url_handlers=self._url_handlers)
+                                            url_handlers=self._url_handlers, registry=self._registry,
+                                            low_memory=self._low_memory)
         return self._parent
 
+    # The length of the parent chain, as far as it is resolved
+    def depth(self) -> int:
+        depth = 0
+        parent = self._parent
+        while isinstance(parent, POM):
+            depth += 1
+            parent = parent._parent
+        return depth
+
+    # `group:artifact:version` as far as it is known, or else where the pom comes from
+    def name(self) -> str:
+        if is_valid(self._group) and is_valid(self._artifact) and is_valid(self._version):
+            return '{}:{}:{}'.format(self._group, self._artifact, self._version)
+        if is_valid(self._urls) and self._urls:
+            return self._urls[0]
+        return '<string>'
+
+    # In low-memory mode, only the model read by the getters is kept, the document is dropped once read
+    @classmethod
+    def from_coordinate(cls, group: str, artifact: str, version: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                        registry: POMRegistry = REGISTRY, low_memory: bool = False):
+        # the same coordinate resolved by the same handlers is shared, so it is fetched & parsed only once
+        key = cls.registry_key(group, artifact, version, url_handlers, low_memory)
+        return registry.get_or_create(key, lambda: cls._create(group, artifact, version, url_handlers, registry,
+                                                               low_memory), is_stale=POM.is_stale)
+
+    # Whether the pom was fetched longer ago than the freshness policy of its url allows, e.g. a -SNAPSHOT
+    # after a day, so that the registry fetches it again: through the cache, it is revalidated then
+    def is_stale(self) -> bool:
+        if is_none(self._fetched_at) or not is_valid(self._urls) or not self._urls:
+            return False
+        cache = get_cache()
+        ttl = policy_ttl(self._urls[0]) if is_none(cache) else cache.ttl(self._urls[0])
+        return not is_none(ttl) and now() - self._fetched_at > ttl
+
+    @classmethod
+    def registry_key(cls, group: str, artifact: str, version: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                     low_memory: bool = False):
+        return cls, group, artifact, version, tuple(url_handlers), low_memory
+
     @classmethod
-    def from_coordinate(cls, group: str, artifact: str, version: str, url_handlers: List[Handler] = DEFAULT_HANDLERS):
+    def _create(cls, group: str, artifact: str, version: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                registry: POMRegistry = REGISTRY, low_memory: bool = False):
         pom = cls()
         pom._artifact = artifact
         pom._group = group
         pom._version = version
         pom._url_handlers = url_handlers
+        pom._registry = registry
+        pom._low_memory = low_memory
         return pom
 
     @classmethod
-    def from_string(cls, plain: str, url_handlers: List[Handler] = DEFAULT_HANDLERS):
+    def from_string(cls, plain: str, url_handlers: List[Handler] = DEFAULT_HANDLERS, low_memory: bool = False):
         pom = cls()
         pom._plain = plain
         pom._url_handlers = url_handlers
+        pom._low_memory = low_memory
         return pom
 
     @classmethod
-    def from_url(cls, url: str, url_handlers: List[Handler] = DEFAULT_HANDLERS):
-        return cls.from_urls([url], url_handlers=url_handlers)
+    def from_bytes(cls, plain: bytes, url_handlers: List[Handler] = DEFAULT_HANDLERS, low_memory: bool = False):
+        return cls.from_string(plain, url_handlers=url_handlers, low_memory=low_memory)
+
+    @classmethod
+    def from_url(cls, url: str, url_handlers: List[Handler] = DEFAULT_HANDLERS, low_memory: bool = False):
+        return cls.from_urls([url], url_handlers=url_handlers, low_memory=low_memory)
 
     @classmethod
-    def from_urls(cls, urls: List[str], url_handlers: List[Handler] = DEFAULT_HANDLERS):
+    def from_urls(cls, urls: List[str], url_handlers: List[Handler] = DEFAULT_HANDLERS, low_memory: bool = False):
         pom = cls()
         pom._urls = urls
         pom._url_handlers = url_handlers
+        pom._low_memory = low_memory
         return pom
 
 
-def fetch(urls: List[str]) -> Union[str, None]:
-    for url in urls:
-        if url.startswith('file://'):
-            url = url[7:]
-            if os.path.exists(url):
-                with open(url, 'r') as f:
-                    return f.read()
-            continue
-        logging.warning('[POM] downloading {}...'.format(url))
-        while True:
-            try:
-                res = requests.get(url)
-                if res.status_code == 404:
-                    logging.warning('[POM] download {} fail, file has been deleted from repository.'.format(url))
-                    break
-                html = res.text
-                return html
-            except Exception as e:
-                logging.error(e)
+# A <profile> of a pom, read in place from the model of the pom rather than parsed or fetched on its own.
+# It shares the coordinate & parent of the pom, its properties are the pom's overridden by the profile's,
+# & it answers the dependencies the profile adds, managed by the profile & the pom.
+class Profile(POM):
+
+    def __init__(self, owner: POM, model: ProfileModel):
+        super().__init__()
+        self.owner = owner
+        self.id = model.id
+        self.activation = model.activation
+        self._model = model
+        self._plain = DISCARDED
+        self._url_handlers = owner._url_handlers
+        self._registry = owner._registry
+        self._low_memory = owner._low_memory
+
+    def get_group_id(self):
+        return self.owner.get_group_id()
+
+    def get_artifact(self):
+        return self.owner.get_artifact()
+
+    def get_version(self):
+        return self.owner.get_version()
+
+    def get_parent(self):
+        return self.owner.get_parent()
+
+    def is_active(self, context: ActivationContext) -> bool:
+        return is_active(self.activation, context)
+
+    @lazy('_dependencies')
+    def get_dependencies(self):
+        if not is_undefined(self._dependencies):
+            return self._dependencies
+        dependencies = {}
+        for d in self._extract_dependencies(self.get_model().dependencies):
+            dependencies.setdefault((d.group, d.artifact), d)
+        self._dependencies = list(dependencies.values())
+        return self._dependencies
+
+    @lazy('_dependencies_management_index')
+    def get_dependencies_management_index(self):
+        if not is_undefined(self._dependencies_management_index):
+            return self._dependencies_management_index
+        dependencies_management = {}
+        for d in self._extract_dependencies(self.get_model().management, is_manage=True):
+            dependencies_management.setdefault((d.group, d.artifact), d)
+        for k, d in self.owner.get_dependencies_management_index().items():
+            dependencies_management.setdefault(k, d)
+        self._dependencies_management_index = dependencies_management
+        return self._dependencies_management_index
+
+    @lazy('_properties')
+    def get_properties(self):
+        if not is_undefined(self._properties):
+            return self._properties
+        own = self.get_model().properties
+        inherited = self.owner.get_properties()
+        if is_none(own) or is_none(inherited):
+            self._properties = inherited if is_none(own) else own
+        else:
+            self._properties = dict(inherited, **own)
+        return self._properties
+
+    @lazy('_effective_properties')
+    def get_effective_properties(self):
+        if not is_undefined(self._effective_properties):
+            return self._effective_properties
+        properties = dict(self.owner.get_effective_properties())
+        for k, v in (self.get_model().properties or {}).items():
+            if v == '${' + k + '}':
+                continue
+            properties[k] = v
+        self._effective_properties = properties
+        return self._effective_properties
+
+
+def _intern(v: Optional[str]) -> Optional[str]:
+    return None if is_none(v) else sys.intern(v)
+
+
+def _parent_of(pom: POM, getter: Callable[[POM], str]) -> str:
+    parent = pom.get_parent()
+    # TODO: but if there is no parent,
+    if is_none(parent):
+        return 'None'
+    return getter(parent)
+
+
+# ${project.XXX} refers to the model rather than to <properties>
+BUILTIN_PROPERTIES: Dict[str, Callable[[POM], str]] = {
+    'project.groupId': POM.get_group_id,
+    'project.artifactId': POM.get_artifact,
+    'project.version': POM.get_version,
+    'project.parent.groupId': lambda p: _parent_of(p, POM.get_group_id),
+    'project.parent.artifactId': lambda p: _parent_of(p, POM.get_artifact),
+    'project.parent.version': lambda p: _parent_of(p, POM.get_version),
+}
+
+
+def fetch(urls: List[str], cache: Optional[DiskCache] = None, transport: Optional[HTTPTransport] = None,
+          group: Optional[str] = None, race: Optional[bool] = None,
+          routes: Optional[RouteStats] = ROUTES) -> Union[str, None]:
+    content = fetch_bytes(urls, cache=cache, transport=transport, group=group, race=race, routes=routes)
+    if is_none(content):
+        return None
+    return decode(content)
+
+
+# Like `fetch`, but the content is left undecoded, as the parser reads it
+def fetch_bytes(urls: List[str], cache: Optional[DiskCache] = None, transport: Optional[HTTPTransport] = None,
+                group: Optional[str] = None, race: Optional[bool] = None,
+                routes: Optional[RouteStats] = ROUTES) -> Union[bytes, None]:
+    if is_none(cache):
+        cache = get_cache()
+    if is_none(transport):
+        transport = get_transport()
+    if is_none(race):
+        race = is_race()
+    if not is_none(routes):
+        urls = routes.order(urls, group)
+    # the repositories demoted for the group are not raced, they are asked after the others, one by one
+    raced = urls if is_none(routes) else [u for u in urls if not routes.is_demoted(u, group)]
+    if not race or len(raced) <= 1:
+        for url in urls:
+            v = _fetch_one(url, cache, transport, group, routes)
+            if not is_none(v):
+                return v
+        return None
+    # request all at once, but still prefer the earlier handlers.
+    # Once one answers, the others are cancelled: the ones not started never are, the ones in flight
+    # stop retrying & reading, & leave no trace in the cache nor the routes; a request still waiting
+    # for its response holds its worker until the read timeout at worst.
+    settled = threading.Event()
+    futures = [get_executor().submit(_fetch_one, url, cache, transport, group, routes, settled) for url in raced]
+    try:
+        for future in futures:
+            v = future.result()
+            if not is_none(v):
+                return v
+    finally:
+        settled.set()
+        for f in futures:
+            f.cancel()
+    for url in urls[len(raced):]:
+        v = _fetch_one(url, cache, transport, group, routes)
+        if not is_none(v):
+            return v
     return None
+
+
+# `cancel` is set once the url lost a race, what it answers then is dropped
+def _fetch_one(url: str, cache: Optional[DiskCache], transport: HTTPTransport, group: Optional[str],
+               routes: Optional[RouteStats], cancel: Optional[threading.Event] = None) -> Union[bytes, None]:
+    v = _fetch_local(url, cache)
+    if not is_remote(v):
+        return v
+    logging.warning('[POM] downloading {}...'.format(url))
+    start = now()
+    try:
+        if is_none(cancel):
+            res = transport.get(url, headers=_validators(url, cache))
+        else:
+            res = transport.get(url, headers=_validators(url, cache), cancel=cancel)
+    except TransportCancelled:
+        return None
+    except TransportError as e:
+        _downloaded(url, None, start)
+        if not is_none(cancel) and cancel.is_set():
+            return None
+        logging.error(e)
+        return _stale(url, cache)
+    _downloaded(url, res, start)
+    if not is_none(cancel) and cancel.is_set():
+        return None
+    return _accept(url, res, cache, group, routes)
+
+
+def _downloaded(url: str, res: Optional[Response], start: float):
+    listener = get_listener()
+    if not is_none(listener):
+        listener.downloaded(url, None if is_none(res) else res.status, _received(res), now() - start)
+
+
+# The bytes of a response on the wire, its decompressed size only if the transport can't tell
+def _received(res: Optional[Response]) -> int:
+    if is_none(res):
+        return 0
+    if not is_none(res.received):
+        return res.received
+    return len(res.content)
+
+
+# The url has to be requested from its repository
+REMOTE = '$remote'
+
+
+def is_remote(v: Union[bytes, str, None]):
+    return v is REMOTE
+
+
+# Answer the url from the file system or the cache, or `REMOTE` if it has to be downloaded
+def _fetch_local(url: str, cache: Optional[DiskCache]) -> Union[bytes, str, None]:
+    if url.startswith('file://'):
+        try:
+            with open(url[7:], 'rb') as f:
+                return f.read()
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+    if not is_none(cache):
+        # the repository is known not to have it, skip without a round-trip
+        if cache.is_missing(url):
+            return None
+        # a stale file is revalidated, see `_validators`
+        if cache.is_fresh(url):
+            content = cache.get(url)
+            if not is_none(content):
+                return content
+    return REMOTE
+
+
+# The conditional headers of a url cached but stale, so that an unchanged file is answered by a 304
+def _validators(url: str, cache: Optional[DiskCache]) -> Optional[Dict[str, str]]:
+    if is_none(cache):
+        return None
+    return cache.validators(url) or None
+
+
+# The stale copy of a url, served when its repository fails rather than failing the pom
+def _stale(url: str, cache: Optional[DiskCache]) -> Union[bytes, None]:
+    if is_none(cache):
+        return None
+    content = cache.get(url)
+    if not is_none(content):
+        logging.warning('[POM] serve the stale copy of {}'.format(url))
+    return content
+
+
+# Take the response of the repository into the cache & routing stats
+def _accept(url: str, res: Response, cache: Optional[DiskCache], group: Optional[str],
+            routes: Optional[RouteStats]) -> Union[bytes, None]:
+    if res.status == 404:
+        logging.warning('[POM] download {} fail, file has been deleted from repository.'.format(url))
+        if not is_none(routes):
+            routes.record(url, group, hit=False)
+        if not is_none(cache):
+            cache.put_missing(url)
+        return None
+    # not modified since cached
+    if res.status == 304 and not is_none(cache):
+        content = cache.get(url)
+        if not is_none(content):
+            cache.touch(url)
+            if not is_none(routes):
+                routes.record(url, group, hit=True)
+            return content
+    if res.status != 200:
+        logging.error('[POM] download {} fail with {}.'.format(url, res.status))
+        return _stale(url, cache)
+    if not is_none(routes):
+        routes.record(url, group, hit=True)
+    if not is_none(cache):
+        cache.put(url, res.content, res.headers)
+    return res.content
+
+
+def decode(content: bytes) -> str:
+    return content.decode('UTF-8', errors='replace')
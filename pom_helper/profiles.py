@@ -0,0 +1,172 @@
+import os
+import platform
+import re
+from typing import Dict, Optional, List, Tuple, Set
+
+import attr
+from attr import dataclass
+
+from .model import ActivationModel
+
+# [1.8,11) or (,1.7] or [1.8]
+RE_RANGE = re.compile('([\\[(])([^,\\])]*)(?:,([^\\])]*))?([\\])])')
+
+
+# What the <activation> of profiles is checked against, like the environment of a maven build
+@dataclass
+class ActivationContext:
+    # -Dxxx=yyy
+    properties: Dict[str, str] = attr.ib(factory=dict)
+    jdk: Optional[str] = None
+    os_name: Optional[str] = None
+    os_family: Optional[str] = None
+    os_arch: Optional[str] = None
+    os_version: Optional[str] = None
+    # where <file> paths are relative to, files are never checked without it
+    basedir: Optional[str] = None
+
+    # The context of this machine, as the jvm would report it
+    @classmethod
+    def current(cls, properties: Optional[Dict[str, str]] = None, jdk: Optional[str] = None,
+                basedir: Optional[str] = None):
+        system = platform.system()
+        if system == 'Windows':
+            family = 'windows'
+        elif system == 'Darwin':
+            family = 'mac'
+        else:
+            family = 'unix'
+        machine = platform.machine().lower()
+        return cls(properties=dict(properties or {}), jdk=jdk,
+                   os_name='mac os x' if system == 'Darwin' else system.lower(), os_family=family,
+                   os_arch='amd64' if machine == 'x86_64' else machine, os_version=platform.release(),
+                   basedir=basedir)
+
+
+def _negated(v: str) -> Tuple[bool, str]:
+    v = v.strip()
+    if v.startswith('!'):
+        return True, v[1:].strip()
+    return False, v
+
+
+def _version_key(v: str) -> Tuple[int, ...]:
+    return tuple(int(i) for i in re.findall('\\d+', v))
+
+
+def _in_range(version: str, spec: str) -> bool:
+    key = _version_key(version)
+    for m in RE_RANGE.finditer(spec):
+        opening, low, high, closing = m.groups()
+        # [1.8] is exactly 1.8
+        if high is None:
+            if opening == '[' and closing == ']' and key == _version_key(low):
+                return True
+            continue
+        if low.strip():
+            lk = _version_key(low)
+            if key < lk or (opening == '(' and key == lk):
+                continue
+        if high.strip():
+            hk = _version_key(high)
+            if key > hk or (closing == ')' and key == hk):
+                continue
+        return True
+    return False
+
+
+def _match_jdk(spec: str, jdk: Optional[str]) -> bool:
+    if jdk is None:
+        return False
+    negated, spec = _negated(spec)
+    if spec[:1] in '[(':
+        matched = _in_range(jdk, spec)
+    else:
+        # 1.8 matches 1.8.0_292, but not 1.80
+        matched = _version_key(jdk)[:len(_version_key(spec))] == _version_key(spec)
+    return matched != negated
+
+
+def _match_text(spec: str, value: Optional[str]) -> bool:
+    negated, spec = _negated(spec)
+    matched = value is not None and value.lower() == spec.lower()
+    return matched != negated
+
+
+def _families(family: Optional[str]) -> Set[str]:
+    if family is None:
+        return set()
+    # a mac is a unix too, like windows is a dos
+    return {family, 'unix'} if family == 'mac' else {family, 'dos'} if family == 'windows' else {family}
+
+
+def _match_os(activation: ActivationModel, context: ActivationContext) -> bool:
+    if activation.os_family is not None:
+        negated, family = _negated(activation.os_family)
+        if (family.lower() in _families(context.os_family)) == negated:
+            return False
+    for spec, value in ((activation.os_name, context.os_name), (activation.os_arch, context.os_arch),
+                        (activation.os_version, context.os_version)):
+        if spec is not None and not _match_text(spec, value):
+            return False
+    return True
+
+
+def _match_property(activation: ActivationModel, context: ActivationContext) -> bool:
+    negated, name = _negated(activation.property_name)
+    value = context.properties.get(name)
+    # <name>!xxx</name> without value means xxx is not defined
+    if activation.property_value is None:
+        return (value is not None) != negated
+    if negated:
+        return False
+    value_negated, expected = _negated(activation.property_value)
+    return (value == expected) != value_negated
+
+
+def _path(spec: str, basedir: Optional[str]) -> Optional[str]:
+    spec = spec.strip()
+    if '${basedir}' in spec:
+        if basedir is None:
+            return None
+        spec = spec.replace('${basedir}', basedir)
+    if os.path.isabs(spec):
+        return spec
+    if basedir is None:
+        return None
+    return os.path.join(basedir, spec)
+
+
+def _match_file(activation: ActivationModel, context: ActivationContext) -> bool:
+    if activation.file_exists is not None:
+        path = _path(activation.file_exists, context.basedir)
+        if path is None or not os.path.exists(path):
+            return False
+    if activation.file_missing is not None:
+        path = _path(activation.file_missing, context.basedir)
+        if path is None or os.path.exists(path):
+            return False
+    return True
+
+
+# Whether the conditions of <activation> hold in the context, all of them have to, like maven 3.2.2+ does.
+# An activation without any condition is never active, see `is_active_by_default` for <activeByDefault>.
+def is_active(activation: Optional[ActivationModel], context: ActivationContext) -> bool:
+    if activation is None:
+        return False
+    checks: List[bool] = []
+    if activation.jdk is not None:
+        checks.append(_match_jdk(activation.jdk, context.jdk))
+    if any(v is not None for v in (activation.os_name, activation.os_family, activation.os_arch,
+                                   activation.os_version)):
+        checks.append(_match_os(activation, context))
+    if activation.property_name is not None:
+        checks.append(_match_property(activation, context))
+    if activation.file_exists is not None or activation.file_missing is not None:
+        checks.append(_match_file(activation, context))
+    return bool(checks) and all(checks)
+
+
+def is_active_by_default(activation: Optional[ActivationModel]) -> bool:
+    return activation is not None and activation.active_by_default is not None and \
+        activation.active_by_default.strip() == 'true'
@@ -0,0 +1,145 @@
+import logging
+import os
+from typing import Dict, List, Optional, Tuple, Iterator
+
+from .pom_helper import POM, Handler, POMError, POMMissing, DEFAULT_HANDLERS, deferred_fetch, is_none
+from .registry import POMRegistry
+
+Coordinate = Tuple[str, str, str]
+
+
+def _pom_file(path: str) -> str:
+    path = os.path.normpath(path)
+    if os.path.isdir(path):
+        return os.path.join(path, 'pom.xml')
+    return path
+
+
+# The modules of a multi-module project checked out on disk, like a maven reactor sees them.
+# Every pom of the tree is parsed once, parents are linked by <relativePath> in memory,
+# & the modules are put in the registry by coordinate, so parents, siblings & boms of the project
+# are answered from disk before any handler is asked. Poms out of the project go to `url_handlers` as usual.
+class Reactor:
+
+    def __init__(self, root: str, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+                 registry: Optional[POMRegistry] = None, low_memory: bool = False):
+        self.root = _pom_file(os.path.abspath(root))
+        self.url_handlers = url_handlers
+        # a registry of its own by default, so that the modules on disk never shadow the released ones elsewhere
+        self.registry = POMRegistry() if is_none(registry) else registry
+        self.low_memory = low_memory
+        # path -> pom, in the order they are found
+        self.modules: Dict[str, POM] = {}
+        self._paths: Dict[POM, str] = {}
+        self._coordinates: Dict[Coordinate, POM] = {}
+        self._load(self.root)
+        self._link_parents()
+        self._register()
+
+    def __iter__(self) -> Iterator[POM]:
+        return iter(self.modules.values())
+
+    def __len__(self):
+        return len(self.modules)
+
+    def get(self, group: str, artifact: str, version: str) -> Optional[POM]:
+        return self._coordinates.get((group, artifact, version))
+
+    def coordinates(self) -> List[Coordinate]:
+        return list(self._coordinates)
+
+    def _load(self, path: str):
+        if path in self.modules:
+            return
+        if not os.path.isfile(path):
+            logging.error('[POM] module {} is not found'.format(path))
+            return
+        pom = POM.from_url('file://' + path, url_handlers=self.url_handlers, low_memory=self.low_memory)
+        pom._registry = self.registry
+        self.modules[path] = pom
+        self._paths[pom] = path
+        directory = os.path.dirname(path)
+        model = pom.get_model()
+        # the modules of every profile too, active or not: they are modules of the project on disk all the same
+        for module in model.modules + [m for profile in model.profiles for m in profile.modules]:
+            if module and module.strip():
+                self._load(_pom_file(os.path.join(directory, module.strip())))
+
+    # Link every module to the pom at its <relativePath> if it is the parent it asks for, like maven does,
+    # otherwise the parent is asked by coordinate: to the registry, then to the handlers
+    def _link_parents(self):
+        for path, pom in list(self.modules.items()):
+            parent = pom.get_model().parent
+            if is_none(parent) or is_none(parent.relative_path) or not parent.relative_path.strip():
+                continue
+            candidate = _pom_file(os.path.join(os.path.dirname(path), parent.relative_path.strip()))
+            if candidate not in self.modules:
+                # a parent out of the modules, e.g. an aggregator's sibling directory
+                if not os.path.isfile(candidate):
+                    continue
+                self._load(candidate)
+            target = self.modules.get(candidate)
+            if is_none(target):
+                continue
+            model = target.get_model()
+            if model.artifact == parent.artifact and (model.group or _parent_group(target)) == parent.group \
+                    and (is_none(parent.version) or (model.version or _parent_version(target)) == parent.version):
+                pom._parent = target
+
+    # Put the modules in the registry once their coordinate is known.
+    # A coordinate which needs another module is tried again once that one is registered,
+    # only when nothing more can be told from the project itself, a module may fetch a pom out of it.
+    def _register(self):
+        pending = list(self.modules.values())
+        while pending:
+            waiting = self._identify(pending, deferred=True)
+            if len(waiting) == len(pending):
+                waiting = self._identify(waiting[:1], deferred=False) + waiting[1:]
+            pending = waiting
+        for pom in self.modules.values():
+            self._relink(pom)
+
+    # Register the poms whose coordinate can be told, answer the others
+    def _identify(self, poms: List[POM], deferred: bool) -> List[POM]:
+        waiting = []
+        for pom in poms:
+            self._relink(pom)
+            try:
+                if deferred:
+                    with deferred_fetch():
+                        coordinate = (pom.get_group_id(), pom.get_artifact(), pom.get_version())
+                else:
+                    coordinate = (pom.get_group_id(), pom.get_artifact(), pom.get_version())
+            except POMMissing:
+                waiting.append(pom)
+                continue
+            except POMError as e:
+                logging.error('[POM] fail to identify module {}: {}'.format(pom.name(), e))
+                continue
+            self._coordinates[coordinate] = pom
+            self.registry.put(POM.registry_key(*coordinate, url_handlers=self.url_handlers,
+                                               low_memory=self.low_memory), pom)
+        return waiting
+
+    # A parent asked by coordinate before its module was registered, is replaced by the module
+    def _relink(self, pom: POM):
+        parent = pom._parent
+        if isinstance(parent, POM) and is_none(self._paths.get(parent)):
+            module = self._coordinates.get((parent._group, parent._artifact, parent._version))
+            if not is_none(module):
+                pom._parent = module
+
+
+def _parent_group(pom: POM) -> Optional[str]:
+    parent = pom.get_model().parent
+    return None if is_none(parent) else parent.group
+
+
+def _parent_version(pom: POM) -> Optional[str]:
+    parent = pom.get_model().parent
+    return None if is_none(parent) else parent.version
+
+
+def load_reactor(root: str, url_handlers: List[Handler] = DEFAULT_HANDLERS, registry: Optional[POMRegistry] = None,
+                 low_memory: bool = False) -> Reactor:
+    return Reactor(root, url_handlers=url_handlers, registry=registry, low_memory=low_memory)
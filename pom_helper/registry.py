@@ -0,0 +1,85 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, Any, Optional, Dict
+
+# Default capacity of the shared registry, large enough for the common parents & boms of a big scan
+DEFAULT_REGISTRY_SIZE = 4096
+
+
+# A size-bounded LRU registry of resolved POMs, so that parents & imported boms are parsed once per process
+class POMRegistry:
+
+    def __init__(self, maxsize: int = DEFAULT_REGISTRY_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            v = self._entries.get(key)
+            if v is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return v
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._put(key, value)
+
+    # An entry `is_stale` says is out of date is dropped & created again
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any],
+                      is_stale: Optional[Callable[[Any], bool]] = None) -> Any:
+        with self._lock:
+            v = self._entries.get(key)
+            if v is not None and is_stale is not None and is_stale(v):
+                del self._entries[key]
+                self.expirations += 1
+                v = None
+            if v is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return v
+            self.misses += 1
+            v = factory()
+            self._put(key, v)
+            return v
+
+    def _put(self, key: Hashable, value: Any):
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        # evict the least recently used
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'expirations': self.expirations}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+
+# The process-wide registry shared by `POM.from_coordinate`, `POM.get_parent` & bom imports
+REGISTRY = POMRegistry()
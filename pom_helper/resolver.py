@@ -0,0 +1,97 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple, Callable, Optional, Dict, Any, TypeVar
+
+from .pom_helper import POM, Package, Dependency, Handler, POMError, POMMissing, DEFAULT_HANDLERS, deferred_fetch
+from .registry import REGISTRY, POMRegistry
+
+DEFAULT_WORKERS = 8
+# Number of coordinates resolved together, bounds the memory of a long stream of coordinates
+DEFAULT_BATCH = 1024
+
+Coordinate = Tuple[str, str, str]
+ErrorHandler = Callable[[Package, Exception], None]
+# What the caller tells its poms apart by, a `Package` but for the cli
+K = TypeVar('K')
+
+
+def log_error(package: Package, e: Exception):
+    logging.error('[POM] fail to resolve {}:{}:{}: {}'.format(package.group, package.artifact, package.version, e))
+
+
+# Resolve the dependencies of many coordinates.
+# The parent & bom graph is walked breadth-first: every round resolves what it can without the network,
+# then the poms missing at this level are fetched together on a pool of `workers`,
+# so the ancestors shared by the coordinates are fetched once and never one after another.
+def resolve_many(coordinates: Iterable[Coordinate], workers: int = DEFAULT_WORKERS,
+                 url_handlers: List[Handler] = DEFAULT_HANDLERS, registry: POMRegistry = REGISTRY,
+                 on_error: Optional[ErrorHandler] = log_error,
+                 batch: int = DEFAULT_BATCH, low_memory: bool = False) -> Iterator[Tuple[Package, List[Dependency]]]:
+    coordinates = iter(coordinates)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pom-resolve') as pool:
+        while True:
+            chunk = list(islice(coordinates, batch))
+            if not chunk:
+                return
+            pending = [(Package(group=g, artifact=a, version=v),
+                        POM.from_coordinate(g, a, v, url_handlers=url_handlers, registry=registry,
+                                            low_memory=low_memory))
+                       for g, a, v in chunk]
+            yield from _resolve_levels(pending, pool, on_error)
+
+
+def _resolve_levels(pending: List[Tuple[K, POM]], pool: ThreadPoolExecutor,
+                    on_error: Optional[Callable[[K, Exception], None]],
+                    getter: Callable[[POM], Any] = POM.get_dependencies) -> Iterator[Tuple[K, Any]]:
+    loaded: Dict[int, POM] = {}
+    # why a pom loaded at a previous level is still missing
+    failures: Dict[int, Exception] = {}
+    while pending:
+        missing: Dict[int, POM] = {}
+        waiting = []
+        for package, pom in pending:
+            try:
+                with deferred_fetch():
+                    dependencies = getter(pom)
+            except POMMissing as e:
+                # loaded but still missing, the load has failed
+                if id(e.pom) in loaded:
+                    _report(on_error, package, _load_error(e.pom, failures.get(id(e.pom))))
+                    continue
+                missing[id(e.pom)] = e.pom
+                waiting.append((package, pom))
+                continue
+            except Exception as e:
+                _report(on_error, package, e)
+                continue
+            yield package, dependencies
+        # fetch the whole level together, the ancestors shared by many coordinates only once
+        futures = {pool.submit(_load, p): k for k, p in missing.items()}
+        for future in as_completed(futures):
+            cause = future.result()
+            if cause is not None:
+                failures[futures[future]] = cause
+        loaded.update(missing)
+        pending = waiting
+
+
+# The error of the load if it failed, reported by the coordinates which need the pom
+def _load(pom: POM) -> Optional[Exception]:
+    try:
+        pom.get_model()
+    except Exception as e:
+        return e
+    return None
+
+
+def _load_error(pom: POM, cause: Optional[Exception]) -> POMError:
+    error = POMError('fail to load {}: {}'.format(pom.name(), getattr(cause, 'message', cause)))
+    # as `raise ... from cause` does
+    error.__cause__ = cause
+    return error
+
+
+def _report(on_error: Optional[Callable[[K, Exception], None]], package: K, e: Exception):
+    if on_error is not None:
+        on_error(package, e)
@@ -0,0 +1,90 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# A repository is demoted for a group prefix after this many misses without a single hit
+DEFAULT_DEMOTE_AFTER = 3
+# Number of leading segments of the groupId a repository is judged by, e.g. `org.apache`
+GROUP_PREFIX_DEPTH = 2
+DEFAULT_RACE_WORKERS = 16
+
+
+def group_prefix(group: Optional[str]) -> str:
+    if not group:
+        return ''
+    return '.'.join(group.split('.')[:GROUP_PREFIX_DEPTH])
+
+
+# The repository a url belongs to, e.g. `https://repo1.maven.org/maven2/` for a pom of central
+def repository_of(url: str, group: Optional[str] = None) -> str:
+    if group:
+        i = url.find('/' + group.replace('.', '/') + '/')
+        if i >= 0:
+            return url[:i + 1]
+    parts = urlsplit(url)
+    return '{}://{}/'.format(parts.scheme, parts.netloc)
+
+
+# Per repository & group prefix hit/miss counters,
+# repositories which never serve a group prefix are tried after the others
+class RouteStats:
+
+    def __init__(self, demote_after: int = DEFAULT_DEMOTE_AFTER):
+        self.demote_after = demote_after
+        self._stats: Dict[Tuple[str, str], List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, url: str, group: Optional[str], hit: bool):
+        key = (repository_of(url, group), group_prefix(group))
+        with self._lock:
+            stat = self._stats.setdefault(key, [0, 0])
+            stat[0 if hit else 1] += 1
+
+    def is_demoted(self, url: str, group: Optional[str]) -> bool:
+        stat = self._stats.get((repository_of(url, group), group_prefix(group)))
+        return stat is not None and stat[0] == 0 and stat[1] >= self.demote_after
+
+    def order(self, urls: List[str], group: Optional[str]) -> List[str]:
+        # stable, so handler priority is kept among the repositories of the same rank
+        return sorted(urls, key=lambda u: self.is_demoted(u, group))
+
+    def stats(self) -> Dict[Tuple[str, str], Tuple[int, int]]:
+        with self._lock:
+            return {k: (v[0], v[1]) for k, v in self._stats.items()}
+
+    def clear(self):
+        with self._lock:
+            self._stats.clear()
+
+
+# The routing stats shared by every `fetch`
+ROUTES = RouteStats()
+
+_race = False
+_race_workers = DEFAULT_RACE_WORKERS
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+# Request the urls of all handlers concurrently instead of one after another
+def set_race(enabled: bool, workers: int = DEFAULT_RACE_WORKERS):
+    global _race, _race_workers, _executor
+    with _executor_lock:
+        _race = enabled
+        if workers != _race_workers and _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+        _race_workers = workers
+
+
+def is_race() -> bool:
+    return _race
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_race_workers, thread_name_prefix='pom-race')
+        return _executor
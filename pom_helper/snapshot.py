@@ -0,0 +1,198 @@
+import json
+import struct
+import zlib
+from typing import List, Iterable, BinaryIO, Dict, Optional, Tuple
+
+from .model import POMModel, ParentModel, DependencyModel, ProfileModel, ActivationModel
+from .pom_helper import POM, Profile, Dependency, Handler, POMError, DEFAULT_HANDLERS, is_none
+from .registry import REGISTRY, POMRegistry
+from .table import StringTable
+
+MAGIC = b'POMS'
+# Bump whenever the layout changes, snapshots of another version are rejected
+FORMAT_VERSION = 3
+HEADER = struct.Struct('>4sH')
+
+
+def _dump_dependencies(deps: Optional[List[Dependency]], s: StringTable):
+    if is_none(deps):
+        return None
+    return tuple((s(d.group), s(d.artifact), s(d.version), s(d.scope), d.optional,
+                  tuple((s(g), s(a)) for g, a in d.exclusions)) for d in deps)
+
+
+def _load_dependencies(record, s: List[Optional[str]]) -> Optional[List[Dependency]]:
+    if is_none(record):
+        return None
+    return [Dependency(group=s[g], artifact=s[a], version=s[v], scope=s[scope], optional=optional,
+                       exclusions=tuple((s[eg], s[ea]) for eg, ea in exclusions))
+            for g, a, v, scope, optional, exclusions in record]
+
+
+def _dump_properties(properties: Optional[Dict[str, str]], s: StringTable):
+    if is_none(properties):
+        return None
+    return tuple((s(k), s(v)) for k, v in properties.items())
+
+
+def _load_properties(record, s: List[Optional[str]]) -> Optional[Dict[str, str]]:
+    if is_none(record):
+        return None
+    return {s[k]: s[v] for k, v in record}
+
+
+def _dump_dependency_models(deps: List[DependencyModel], s: StringTable):
+    return tuple((s(d.group), s(d.artifact), s(d.version), s(d.scope), s(d.optional),
+                  tuple((s(g), s(a)) for g, a in d.exclusions)) for d in deps)
+
+
+def _load_dependency_models(record, s: List[Optional[str]]) -> List[DependencyModel]:
+    return [DependencyModel(s[g], s[a], s[v], s[scope], s[optional], tuple((s[eg], s[ea]) for eg, ea in exclusions))
+            for g, a, v, scope, optional, exclusions in record]
+
+
+def _dump_activation(activation: Optional[ActivationModel], s: StringTable):
+    if is_none(activation):
+        return None
+    return tuple(s(getattr(activation, k)) for k in ActivationModel.__slots__)
+
+
+def _load_activation(record, s: List[Optional[str]]) -> Optional[ActivationModel]:
+    if is_none(record):
+        return None
+    activation = ActivationModel()
+    for k, i in zip(ActivationModel.__slots__, record):
+        setattr(activation, k, s[i])
+    return activation
+
+
+# The model is kept, so that what is read from it, e.g. the active profiles, needs no document either
+def _dump_model(model: POMModel, s: StringTable) -> tuple:
+    parent = model.parent
+    return (
+        s(model.group), s(model.artifact), s(model.version),
+        None if is_none(parent) else (s(parent.group), s(parent.artifact), s(parent.version), s(parent.relative_path)),
+        _dump_properties(model.properties, s),
+        _dump_dependency_models(model.dependencies, s),
+        _dump_dependency_models(model.management, s),
+        tuple((s(p.id), _dump_activation(p.activation, s), _dump_model(p, s)) for p in model.profiles),
+        tuple(s(m) for m in model.modules),
+    )
+
+
+def _load_model(record, s: List[Optional[str]], model: POMModel) -> POMModel:
+    g, a, v, parent, properties, deps, management, profiles, modules = record
+    model.group, model.artifact, model.version = s[g], s[a], s[v]
+    model.parent = None if is_none(parent) else ParentModel(*(s[i] for i in parent))
+    model.properties = _load_properties(properties, s)
+    model.dependencies = _load_dependency_models(deps, s)
+    model.management = _load_dependency_models(management, s)
+    model.profiles = []
+    for pid, activation, profile in profiles:
+        p = _load_model(profile, s, ProfileModel())
+        p.id = s[pid]
+        p.activation = _load_activation(activation, s)
+        model.profiles.append(p)
+    model.modules = [s[m] for m in modules]
+    return model
+
+
+def _dump_pom(pom: POM, s: StringTable) -> tuple:
+    parent = pom.get_parent()
+    profiles = pom.get_profiles()
+    return (
+        s(pom.get_group_id()), s(pom.get_artifact()), s(pom.get_version()),
+        None if is_none(parent) else (s(parent.get_group_id()), s(parent.get_artifact()), s(parent.get_version())),
+        _dump_properties(pom.get_properties(), s),
+        _dump_properties(pom.get_effective_properties(), s),
+        _dump_dependencies(pom.get_dependencies(), s),
+        _dump_dependencies(pom.get_dependencies_management(), s),
+        None if is_none(profiles) else tuple((s(pid), _dump_pom(p, s)) for pid, p in profiles.items()),
+        # a profile is a view of its pom's model
+        None if isinstance(pom, Profile) else _dump_model(pom.get_model(), s),
+    )
+
+
+# Serialize fully resolved poms, everything the getters answer is resolved first.
+# The records are compressed json of string ids, so a snapshot is read the same by any python.
+def dumps(poms: Iterable[POM]) -> bytes:
+    s = StringTable()
+    records = [_dump_pom(p, s) for p in poms]
+    return HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(
+        json.dumps([s.values, records], separators=(',', ':')).encode('UTF-8'))
+
+
+def dump(poms: Iterable[POM], fp: BinaryIO):
+    fp.write(dumps(poms))
+
+
+def _load_resolved(pom: POM, record, s: List[Optional[str]]):
+    properties, effective_properties, deps, management = record[4:8]
+    pom._properties = _load_properties(properties, s)
+    pom._effective_properties = _load_properties(effective_properties, s)
+    pom._dependencies = _load_dependencies(deps, s)
+    pom._dependencies_management = _load_dependencies(management, s)
+    pom._dependencies_management_index = {(d.group, d.artifact): d for d in pom._dependencies_management}
+
+
+def _load_pom(record, s: List[Optional[str]], url_handlers: List[Handler], registry: POMRegistry,
+              loaded: Dict[Tuple[str, str, str], POM]) -> POM:
+    g, a, v, parent_coordinate = record[:4]
+    profiles, model = record[8:]
+    pom = POM._create(s[g], s[a], s[v], url_handlers=url_handlers, registry=registry)
+    pom._model = _load_model(model, s, POMModel())
+    if is_none(parent_coordinate):
+        pom._parent = None
+    else:
+        pg, pa, pv = (s[i] for i in parent_coordinate)
+        # a parent out of the snapshot is resolved only if it is asked for
+        pom._parent = loaded.get((pg, pa, pv)) or POM.from_coordinate(pg, pa, pv, url_handlers=url_handlers,
+                                                                      registry=registry)
+    _load_resolved(pom, record, s)
+    if is_none(profiles):
+        pom._profiles = None
+    else:
+        models = {p.id: p for p in pom._model.profiles}
+        pom._profiles = {}
+        for pid, p in profiles:
+            profile = pom._profiles[s[pid]] = Profile(pom, models[s[pid]])
+            _load_resolved(profile, p, s)
+    return pom
+
+
+# Rebuild the poms of a snapshot without parsing or fetching anything,
+# and share them through the registry like `POM.from_coordinate` does
+def loads(data: bytes, url_handlers: List[Handler] = DEFAULT_HANDLERS,
+          registry: POMRegistry = REGISTRY) -> List[POM]:
+    if len(data) < HEADER.size:
+        raise POMError('invalid snapshot')
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise POMError('invalid snapshot')
+    if version != FORMAT_VERSION:
+        raise POMError('snapshot version {} is not supported, expect {}'.format(version, FORMAT_VERSION))
+    loaded: Dict[Tuple[str, str, str], POM] = {}
+    try:
+        s, records = json.loads(zlib.decompress(data[HEADER.size:]).decode('UTF-8'))
+        coordinates = [(s[r[0]], s[r[1]], s[r[2]]) for r in records]
+        poms = []
+        for coordinate, record in zip(coordinates, records):
+            pom = _load_pom(record, s, url_handlers, registry, loaded)
+            loaded[coordinate] = pom
+            poms.append(pom)
+    except (zlib.error, ValueError, TypeError, IndexError, KeyError):
+        raise POMError('invalid snapshot')
+    # link the parents which come later than their children
+    for pom in poms:
+        parent = pom._parent
+        if not is_none(parent):
+            key = (parent._group, parent._artifact, parent._version)
+            if key in loaded:
+                pom._parent = loaded[key]
+    for coordinate, pom in zip(coordinates, poms):
+        registry.put(POM.registry_key(*coordinate, url_handlers=url_handlers), pom)
+    return poms
+
+
+def load(fp: BinaryIO, url_handlers: List[Handler] = DEFAULT_HANDLERS, registry: POMRegistry = REGISTRY) -> List[POM]:
+    return loads(fp.read(), url_handlers=url_handlers, registry=registry)
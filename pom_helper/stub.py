@@ -0,0 +1,81 @@
+import gzip
+import hashlib
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Union
+
+
+# A local stand-in of a maven repository, serving `files` & answering 404 for anything else,
+# for the tests & the benchmarks
+class StubRepository:
+
+    def __init__(self, files: Dict[str, bytes] = None):
+        self.files = files if files is not None else {}
+        # statuses to answer before serving a path, e.g. {'/a.pom': [503, 503]}
+        self.failures: Dict[str, List[int]] = {}
+        self.requests = Counter()
+        # requests answered by a 304, every file is served with an ETag of its content
+        self.not_modified = Counter()
+        # seconds to wait before answering, to keep requests in flight
+        self.delay = 0.0
+        # gzip the files for the clients which accept it
+        self.gzip = False
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers & body are written apart, don't let them wait for each other's ack
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                stub.requests[self.path] += 1
+                time.sleep(stub.delay)
+                failures = stub.failures.get(self.path)
+                if failures:
+                    self._send(failures.pop(0), b'')
+                elif self.path in stub.files:
+                    content = stub.files[self.path]
+                    etag = '"{}"'.format(hashlib.sha1(content).hexdigest())
+                    if self.headers.get('If-None-Match') == etag:
+                        stub.not_modified[self.path] += 1
+                        self._send(304, b'', etag)
+                    elif stub.gzip and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                        self._send(200, gzip.compress(content), etag, encoding='gzip')
+                    else:
+                        self._send(200, content, etag)
+                else:
+                    self._send(404, b'')
+
+            def _send(self, status, body, etag=None, encoding=None):
+                self.send_response(status)
+                if etag is not None:
+                    self.send_header('ETag', etag)
+                if encoding is not None:
+                    self.send_header('Content-Encoding', encoding)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_address[1])
+        self._thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+
+    def handler(self, group: str, artifact: str, version: str):
+        return '{}/{}/{}/{}/{}-{}.pom'.format(self.url, group.replace('.', '/'), artifact, version, artifact, version)
+
+    def add(self, group: str, artifact: str, version: str, content: Union[bytes, str]):
+        self.files[self.handler(group, artifact, version)[len(self.url):]] = \
+            content.encode('UTF-8') if isinstance(content, str) else content
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+from itertools import islice
+from typing import Dict, List, Optional, Iterable, Iterator, Tuple, Union, BinaryIO
+
+from .pom_helper import Package, Dependency, POMError, is_none
+
+MAGIC = b'POMT'
+# Bump whenever the layout changes, tables of another version are rejected
+FORMAT_VERSION = 2
+HEADER = struct.Struct('>4sH')
+# The rows & the size of the string list, then the strings as json, then every column as little-endian uint32
+# & the optional flags as bytes: the same file on any platform & python
+BODY = struct.Struct('<QQ')
+# The string columns, every cell is an index in the string table
+COLUMNS = ('source_group', 'source_artifact', 'source_version', 'group', 'artifact', 'version', 'scope')
+# Results written to sqlite at once
+DEFAULT_EXPORT_BATCH = 4096
+
+Results = Iterable[Tuple[Package, List[Dependency]]]
+
+
+# Interns strings into a dictionary, every string is stored once & referred by its index, None is 0
+class StringTable:
+    __slots__ = ('index', 'values')
+
+    def __init__(self, values: Optional[List[Optional[str]]] = None):
+        self.values: List[Optional[str]] = [None] if values is None else values
+        self.index: Dict[Optional[str], int] = {v: i for i, v in enumerate(self.values)}
+
+    def __call__(self, s: Optional[str]) -> int:
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.values)
+            self.values.append(s)
+        return i
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        return self.values[i]
+
+    def __len__(self):
+        return len(self.values)
+
+
+# The dependency edges of many artifacts, as dictionary-encoded columns of machine integers
+# rather than a `Dependency` per edge: a row is 7 string ids & an optional flag, whatever the strings are.
+class DependencyTable:
+    __slots__ = ('strings', 'columns', 'optional')
+
+    def __init__(self, strings: Optional[StringTable] = None):
+        self.strings = StringTable() if is_none(strings) else strings
+        self.columns: Dict[str, array] = {c: array('I') for c in COLUMNS}
+        self.optional = array('B')
+
+    def add(self, package: Package, dependencies: Iterable[Dependency]):
+        s = self.strings
+        source = (s(package.group), s(package.artifact), s(package.version))
+        c = [self.columns[k] for k in COLUMNS]
+        for d in dependencies:
+            for column, v in zip(c, source + (s(d.group), s(d.artifact), s(d.version), s(d.scope))):
+                column.append(v)
+            self.optional.append(1 if d.optional else 0)
+
+    # Take the results of `resolve_many` or `aresolve_many` as they come
+    def extend(self, results: Results) -> 'DependencyTable':
+        for package, dependencies in results:
+            self.add(package, dependencies)
+        return self
+
+    def __len__(self):
+        return len(self.optional)
+
+    # A row decoded into (source group, source artifact, source version, group, artifact, version, scope, optional)
+    def row(self, i: int) -> tuple:
+        return tuple(self.strings[self.columns[k][i]] for k in COLUMNS) + (bool(self.optional[i]),)
+
+    def rows(self) -> Iterator[tuple]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def column(self, name: str) -> List[Optional[str]]:
+        values = self.strings.values
+        return [values[i] for i in self.columns[name]]
+
+    def clear(self):
+        for c in self.columns.values():
+            del c[:]
+        del self.optional[:]
+
+    def dumps(self) -> bytes:
+        strings = json.dumps(self.strings.values, separators=(',', ':')).encode('UTF-8')
+        body = [BODY.pack(len(self), len(strings)), strings]
+        body.extend(_to_uint32(self.columns[k]) for k in COLUMNS)
+        body.append(self.optional.tobytes())
+        return HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(b''.join(body))
+
+    def dump(self, fp: BinaryIO):
+        fp.write(self.dumps())
+
+    @classmethod
+    def loads(cls, data: bytes) -> 'DependencyTable':
+        if len(data) < HEADER.size:
+            raise POMError('invalid dependency table')
+        magic, version = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise POMError('invalid dependency table')
+        if version != FORMAT_VERSION:
+            raise POMError('dependency table version {} is not supported, expect {}'.format(version, FORMAT_VERSION))
+        try:
+            body = zlib.decompress(data[HEADER.size:])
+            rows, size = BODY.unpack_from(body)
+            offset = BODY.size + size
+            table = cls(StringTable(json.loads(body[BODY.size:offset].decode('UTF-8'))))
+            for k in COLUMNS:
+                table.columns[k] = _from_uint32(body[offset:offset + 4 * rows], rows)
+                offset += 4 * rows
+            table.optional.frombytes(body[offset:offset + rows])
+            if len(table.optional) != rows or offset + rows != len(body):
+                raise ValueError('truncated')
+            if max((max(c, default=0) for c in table.columns.values()), default=0) >= len(table.strings):
+                raise ValueError('unknown string')
+        except (zlib.error, struct.error, ValueError, TypeError):
+            raise POMError('invalid dependency table')
+        return table
+
+    @classmethod
+    def load(cls, fp: BinaryIO) -> 'DependencyTable':
+        return cls.loads(fp.read())
+
+
+def _to_uint32(column: array) -> bytes:
+    if column.itemsize == 4 and sys.byteorder == 'little':
+        return column.tobytes()
+    return struct.pack('<{}I'.format(len(column)), *column)
+
+
+def _from_uint32(data: bytes, rows: int) -> array:
+    if len(data) != 4 * rows:
+        raise ValueError('truncated')
+    column = array('I')
+    if column.itemsize == 4:
+        column.frombytes(data)
+        if sys.byteorder != 'little':
+            column.byteswap()
+        return column
+    column.extend(struct.unpack('<{}I'.format(rows), data))
+    return column
+
+
+SCHEMA = '''
+DROP VIEW IF EXISTS dependencies_text;
+DROP TABLE IF EXISTS dependencies;
+DROP TABLE IF EXISTS strings;
+CREATE TABLE strings (id INTEGER PRIMARY KEY, value TEXT);
+CREATE TABLE dependencies ({});
+CREATE VIEW dependencies_text AS SELECT {} FROM dependencies d {};
+'''.format(', '.join('"{}" INTEGER'.format(c) for c in COLUMNS + ('optional',)),
+           ', '.join(['s{0}.value AS "{1}"'.format(i, c) for i, c in enumerate(COLUMNS)] + ['d.optional']),
+           ' '.join('JOIN strings s{0} ON s{0}.id = d."{1}"'.format(i, c) for i, c in enumerate(COLUMNS)))
+
+
+# Write dependency edges into a sqlite database, replacing what it had: `strings` is the dictionary,
+# `dependencies` the rows of string ids, & the `dependencies_text` view joins them back (quote "group", a keyword).
+# `results` are streamed in batches, only the string dictionary grows with them.
+def export_sqlite(results: Union[Results, DependencyTable], database: Union[str, sqlite3.Connection],
+                  batch: int = DEFAULT_EXPORT_BATCH) -> int:
+    connection = sqlite3.connect(database) if isinstance(database, str) else database
+    try:
+        connection.executescript(SCHEMA)
+        rows = 0
+        if isinstance(results, DependencyTable):
+            table, chunks = results, [None]
+        else:
+            table = DependencyTable()
+            results = iter(results)
+            chunks = iter(lambda: list(islice(results, batch)), [])
+        written = 0
+        insert = 'INSERT INTO dependencies VALUES ({})'.format(', '.join('?' * (len(COLUMNS) + 1)))
+        for chunk in chunks:
+            if chunk is not None:
+                table.clear()
+                table.extend(chunk)
+            connection.executemany('INSERT INTO strings VALUES (?, ?)',
+                                   ((i, table.strings[i]) for i in range(written, len(table.strings))))
+            written = len(table.strings)
+            connection.executemany(insert, zip(*[table.columns[k] for k in COLUMNS], table.optional))
+            rows += len(table)
+        connection.commit()
+        return rows
+    finally:
+        if isinstance(database, str):
+            connection.close()
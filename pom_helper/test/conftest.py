@@ -0,0 +1,22 @@
+import pytest
+
+from pom_helper import HTTPTransport, set_transport
+from pom_helper.stub import StubRepository
+from pom_helper.test.stub import DirectoryRepository
+
+
+# A stub repository over http, fetched through a transport which never waits between retries
+@pytest.fixture
+def repo():
+    with StubRepository() as stub:
+        set_transport(HTTPTransport(backoff=0))
+        try:
+            yield stub
+        finally:
+            set_transport(None)
+
+
+# A repository in the test's own directory
+@pytest.fixture
+def disk_repo(tmp_path):
+    return DirectoryRepository(str(tmp_path / 'repository'))
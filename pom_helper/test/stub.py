@@ -0,0 +1,35 @@
+import os
+from typing import Union
+
+# A parent managing x:y by a property, & a child of it depending on x:y, resolved to 2.0.
+# `CHILD.format(suffix)` is the pom of `g:child<suffix>:1`.
+PARENT = b'''<project>
+  <groupId>g</groupId><artifactId>parent</artifactId><version>1</version>
+  <properties><x.version>2.0</x.version></properties>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>x</groupId><artifactId>y</artifactId><version>${x.version}</version></dependency>
+  </dependencies></dependencyManagement>
+</project>'''
+
+CHILD = '''<project>
+  <parent><groupId>g</groupId><artifactId>parent</artifactId><version>1</version></parent>
+  <artifactId>child{}</artifactId>
+  <dependencies><dependency><groupId>x</groupId><artifactId>y</artifactId></dependency></dependencies>
+</project>'''
+
+
+# A repository like `pom_helper.stub.StubRepository`, laid out on disk & answered by file:// urls
+class DirectoryRepository:
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def handler(self, group: str, artifact: str, version: str):
+        return 'file://{}/{}/{}/{}/{}-{}.pom'.format(self.directory, group.replace('.', '/'), artifact, version,
+                                                     artifact, version)
+
+    def add(self, group: str, artifact: str, version: str, content: Union[bytes, str]):
+        path = self.handler(group, artifact, version)[len('file://'):]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content.encode('UTF-8') if isinstance(content, str) else content)
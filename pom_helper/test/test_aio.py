@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from pom_helper import POMRegistry, Package
+from pom_helper.aio import AsyncPOM, AsyncTransport, aresolve_many
+
+web = pytest.importorskip('aiohttp.web')
+
+PARENT = b'''<project>
+  <groupId>g</groupId><artifactId>parent</artifactId><version>1</version>
+  <properties><x.version>2.0</x.version></properties>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>g</groupId><artifactId>bom</artifactId><version>1</version><scope>import</scope></dependency>
+  </dependencies></dependencyManagement>
+</project>'''
+
+BOM = b'''<project>
+  <groupId>g</groupId><artifactId>bom</artifactId><version>1</version>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>x</groupId><artifactId>y</artifactId><version>3.0</version></dependency>
+  </dependencies></dependencyManagement>
+</project>'''
+
+CHILD = '''<project>
+  <parent><groupId>g</groupId><artifactId>parent</artifactId><version>1</version></parent>
+  <artifactId>child{}</artifactId>
+  <dependencies>
+    <dependency><groupId>x</groupId><artifactId>y</artifactId></dependency>
+    <dependency><groupId>x</groupId><artifactId>z</artifactId><version>${{x.version}}</version></dependency>
+  </dependencies>
+</project>'''
+
+
+# A local asyncio stand-in of a maven repository
+async def serve(files):
+    requests = []
+
+    async def handle(request):
+        requests.append(request.path)
+        await asyncio.sleep(0.01)
+        if request.path in files:
+            return web.Response(body=files[request.path])
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get('/{path:.*}', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = 'http://127.0.0.1:{}'.format(port)
+
+    def handler(group, artifact, version):
+        return '{}/{}/{}/{}/{}-{}.pom'.format(url, group.replace('.', '/'), artifact, version, artifact, version)
+
+    files['/g/parent/1/parent-1.pom'] = PARENT
+    files['/g/bom/1/bom-1.pom'] = BOM
+    for i in range(8):
+        files['/g/child{}/1/child{}-1.pom'.format(i, i)] = CHILD.format(i).encode()
+    return runner, handler, requests
+
+
+def test_async_pom():
+    async def run():
+        runner, handler, requests = await serve({})
+        transport = AsyncTransport(limit=4, backoff=0)
+        try:
+            registry = POMRegistry()
+            poms = [AsyncPOM.from_coordinate('g', 'child{}'.format(i), '1', url_handlers=[handler],
+                                             registry=registry, transport=transport) for i in range(8)]
+            results = await asyncio.gather(*[p.get_dependencies() for p in poms])
+            errors = []
+            resolved = [r async for r in aresolve_many([('g', 'child0', '1'), ('g', 'none', '1')],
+                                                       url_handlers=[handler], registry=registry,
+                                                       transport=transport, on_error=lambda p, e: errors.append(p))]
+        finally:
+            await transport.close()
+            await runner.cleanup()
+        return results, resolved, errors, requests
+
+    results, resolved, errors, requests = asyncio.run(run())
+    assert all(sorted((d.group, d.artifact, d.version) for d in r) == [('x', 'y', '3.0'), ('x', 'z', '2.0')]
+               for r in results)
+    assert [p for p, _ in resolved] == [Package(group='g', artifact='child0', version='1')]
+    assert errors == [Package(group='g', artifact='none', version='1')]
+    # the parent & bom shared by all the children are downloaded once
+    assert requests.count('/g/parent/1/parent-1.pom') == 1 and requests.count('/g/bom/1/bom-1.pom') == 1
@@ -0,0 +1,16 @@
+from benchmarks.corpus import deep_chain, huge_bom, many_profiles, property_heavy, wide_graph
+from benchmarks.run import FileRepository, HTTPRepository, measure, report
+
+
+def test_small_corpora():
+    corpora = [deep_chain(depth=4, managed=2), huge_bom(size=32, roots=2, used=4), property_heavy(count=16, used=4),
+               many_profiles(count=4, deps=2), wide_graph(width=3, depth=2)]
+    results = []
+    for corpus in corpora:
+        with FileRepository(corpus) as repository:
+            results.append(measure(corpus, repository))
+    with HTTPRepository(corpora[0]) as repository:
+        results.append(measure(corpora[0], repository))
+    # every pom of the chain is fetched once while resolving
+    assert results[0]['fetches'] == results[-1]['fetches'] == len(corpora[0].poms)
+    assert len(report(results).splitlines()) == len(results) + 1
@@ -0,0 +1,98 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from pom_helper import DiskCache, FreshnessPolicy, HTTPTransport, POM, POMRegistry, set_cache
+from pom_helper.pom_helper import fetch, fetch_bytes
+from pom_helper.stub import StubRepository
+from pom_helper.test.stub import PARENT, CHILD
+
+# nothing listens here, so a test passes only if it never leaves the cache
+URL = 'http://127.0.0.1:9/maven2/g/a/1/a-1.pom'
+
+
+def test_layout(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.path('https://repo1.maven.org/maven2/org/x/a/1/a-1.pom') == os.path.join(
+        str(tmp_path), 'repo1.maven.org', 'maven2', 'org', 'x', 'a', '1', 'a-1.pom')
+
+
+def test_hit(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    assert cache.get(URL) is None
+    cache.put(URL, b'<project/>')
+    assert cache.get(URL) == b'<project/>'
+    assert fetch([URL], cache=cache) == '<project/>'
+
+
+def test_negative(tmp_path):
+    cache = DiskCache(str(tmp_path), negative_ttl=60)
+    cache.put_missing(URL)
+    assert cache.is_missing(URL)
+    assert fetch([URL], cache=cache) is None
+    expired = DiskCache(str(tmp_path), negative_ttl=0)
+    assert not expired.is_missing(URL)
+
+
+def test_revalidate(tmp_path):
+    release, snapshot = b'<project>1</project>', b'<project>2</project>'
+    with StubRepository() as repo:
+        repo.add('g', 'a', '1', release)
+        repo.add('g', 'a', '2-SNAPSHOT', snapshot)
+        transport = HTTPTransport(backoff=0)
+        urls = [repo.handler('g', 'a', '1'), repo.handler('g', 'a', '2-SNAPSHOT')]
+        paths = [u[len(repo.url):] for u in urls]
+        cache = DiskCache(str(tmp_path), policies=[FreshnessPolicy('*-SNAPSHOT/*', 0), FreshnessPolicy('*', None)])
+        for _ in range(3):
+            assert [fetch_bytes([u], cache=cache, transport=transport) for u in urls] == [release, snapshot]
+        # the release is cached for good, the snapshot is revalidated by its etag every time
+        assert repo.requests[paths[0]] == 1
+        assert repo.requests[paths[1]] == 3 and repo.not_modified[paths[1]] == 2
+        # a changed snapshot is downloaded again
+        repo.add('g', 'a', '2-SNAPSHOT', b'<project>3</project>')
+        assert fetch_bytes([urls[1]], cache=cache, transport=transport) == b'<project>3</project>'
+        daily = DiskCache(str(tmp_path))
+        assert daily.is_fresh(urls[1]) and daily.ttl(urls[0]) is None
+    # the repository is gone, the stale copy is served
+    assert fetch_bytes([urls[1]], cache=cache, transport=HTTPTransport(retries=0)) == b'<project>3</project>'
+
+
+def test_concurrent_put(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    contents = [('<project>{}</project>'.format(i) * 100).encode() for i in range(8)]
+
+    def put(content):
+        for _ in range(50):
+            cache.put(URL, content)
+            assert cache.get(URL) in contents
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(put, contents))
+    assert cache.get(URL) in contents
+    # no temporary file is left behind
+    assert os.listdir(os.path.dirname(cache.path(URL))) == ['a-1.pom']
+
+
+def test_registry_revalidates_snapshot(tmp_path, repo):
+    snapshot = CHILD.format('').replace('<artifactId>child</artifactId>', '<artifactId>a</artifactId>')
+    repo.add('g', 'parent', '1', PARENT)
+    repo.add('g', 'a', '1-SNAPSHOT', snapshot)
+    registry = POMRegistry()
+
+    def resolve(version):
+        pom = POM.from_coordinate('g', 'a', version, url_handlers=[repo.handler], registry=registry)
+        return pom, [(d.artifact, d.version) for d in pom.get_dependencies()]
+
+    set_cache(DiskCache(str(tmp_path), policies=[FreshnessPolicy('*-SNAPSHOT/*', 0), FreshnessPolicy('*', None)]))
+    try:
+        first, dependencies = resolve('1-SNAPSHOT')
+        assert dependencies == [('y', '2.0')]
+        # the snapshot changes in the same process
+        repo.add('g', 'a', '1-SNAPSHOT', snapshot.replace('</dependencies>', '<dependency><groupId>x</groupId>'
+                                                          '<artifactId>z</artifactId><version>1</version>'
+                                                          '</dependency></dependencies>'))
+        second, dependencies = resolve('1-SNAPSHOT')
+        assert second is not first and dependencies == [('y', '2.0'), ('z', '1')]
+        # the release parent is shared all along
+        assert second.get_parent() is first.get_parent() and registry.stats()['expirations'] == 1
+    finally:
+        set_cache(None)
@@ -0,0 +1,45 @@
+import io
+import json
+
+from pom_helper.cli import main, run, repository_handler
+from pom_helper.test.stub import PARENT, CHILD
+
+
+def test_stream_and_resume(tmp_path, repo):
+    (tmp_path / 'local.pom').write_text(CHILD.format('-local'))
+    lines = ['g:child{}:1'.format(i) for i in range(6)] + ['# comment', 'g:none:1', 'bad', str(tmp_path / 'local.pom')]
+    (tmp_path / 'input.txt').write_text('\n'.join(lines))
+    repo.add('g', 'parent', '1', PARENT)
+    for i in range(6):
+        repo.add('g', 'child{}'.format(i), '1', CHILD.format(i))
+    # a first run interrupted after a few lines
+    out = io.StringIO()
+    run(lines[:3], out, [repository_handler(repo.url)], workers=2, batch=2, checkpoint=str(tmp_path / 'checkpoint'))
+    assert len(out.getvalue().splitlines()) == 3
+    code = main([str(tmp_path / 'input.txt'), '-o', str(tmp_path / 'out.jsonl'), '--checkpoint',
+                 str(tmp_path / 'checkpoint'), '--repository', repo.url, '--no-central', '-w', '2', '-q'])
+    assert code == 1
+    records = {r['input']: r for r in map(json.loads, (tmp_path / 'out.jsonl').read_text().splitlines())}
+    # the lines done by the first run are skipped
+    assert set(records) == set(lines[3:]) - {'# comment'}
+    assert records['g:child3:1']['dependencies'][0]['version'] == '2.0'
+    assert records['g:child3:1']['management'][0]['artifact'] == 'y'
+    assert records[str(tmp_path / 'local.pom')]['artifact'] == 'child-local'
+    assert 'error' in records['g:none:1'] and 'error' in records['bad']
+
+
+def test_local_index_and_summary(tmp_path, disk_repo, capsys):
+    disk_repo.add('g', 'parent', '1', PARENT)
+    disk_repo.add('g', 'child', '1', CHILD.format(''))
+    (tmp_path / 'input.txt').write_text('g:child:1\ng:none:1\n')
+    index = tmp_path / 'index.json'
+    args = [str(tmp_path / 'input.txt'), '-o', str(tmp_path / 'out.jsonl'), '--no-central',
+            '--local-repository', disk_repo.directory, '--local-index', str(index)]
+    assert main(args) == 1
+    assert index.exists()
+    assert capsys.readouterr().err.strip().endswith('1 resolved, 1 failed')
+    # the index is read rather than scanned again, & -q keeps stderr quiet
+    disk_repo.add('g', 'child', '2', CHILD.format(''))
+    (tmp_path / 'input.txt').write_text('g:child:2\n')
+    assert main(args + ['-q']) == 1
+    assert capsys.readouterr().err == ''
@@ -0,0 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pom_helper import POM, POMRegistry
+from pom_helper.test.stub import PARENT, CHILD
+
+
+def test_single_flight(repo):
+    repo.delay = 0.1
+    repo.add('g', 'parent', '1', PARENT)
+    for i in range(4):
+        repo.add('g', 'child{}'.format(i), '1', CHILD.format(i))
+    registry = POMRegistry()
+    # 4 threads share each child, & all the children share the parent
+    poms = [POM.from_coordinate('g', 'child{}'.format(i % 4), '1', url_handlers=[repo.handler], registry=registry)
+            for i in range(16)]
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda p: p.get_dependencies(), poms))
+    assert all([(d.group, d.artifact, d.version) for d in r] == [('x', 'y', '2.0')] for r in results)
+    assert set(repo.requests.values()) == {1} and len(repo.requests) == 5
@@ -0,0 +1,52 @@
+from pom_helper import POMRegistry
+from pom_helper.graph import TransitiveResolver
+
+
+def project(artifact, version, dependencies='', management=''):
+    return '''<project>
+      <groupId>g</groupId><artifactId>{}</artifactId><version>{}</version>
+      <dependencyManagement><dependencies>{}</dependencies></dependencyManagement>
+      <dependencies>{}</dependencies>
+    </project>'''.format(artifact, version, management, dependencies)
+
+
+def dependency(artifact, version='1', scope='compile', optional='false', exclusions=''):
+    return '''<dependency><groupId>g</groupId><artifactId>{}</artifactId><version>{}</version><scope>{}</scope>
+      <optional>{}</optional><exclusions>{}</exclusions></dependency>'''.format(artifact, version, scope, optional,
+                                                                            exclusions)
+
+
+POMS = {
+    ('root', '1'): project('root', '1', dependency('a', exclusions='<exclusion><groupId>g</groupId>'
+                                                                   '<artifactId>x</artifactId></exclusion>') +
+                           dependency('t', scope='test') + dependency('o', optional='true'),
+                           management=dependency('b', version='9')),
+    ('a', '1'): project('a', '1', dependency('b') + dependency('x') + dependency('c', scope='runtime') +
+                        dependency('p', scope='provided') + dependency('q', optional='true')),
+    ('b', '9'): project('b', '9', dependency('c', version='2')),
+    ('c', '1'): project('c', '1'),
+    ('t', '1'): project('t', '1', dependency('d')),
+    ('d', '1'): project('d', '1'),
+    ('o', '1'): project('o', '1', dependency('e')),
+    ('e', '1'): project('e', '1'),
+}
+
+
+def test_transitive(disk_repo):
+    for (artifact, version), content in POMS.items():
+        disk_repo.add('g', artifact, version, content)
+    handler = disk_repo.handler
+    resolver = TransitiveResolver(url_handlers=[handler], registry=POMRegistry(), on_error=None)
+    graph = resolver.resolve('g', 'root', '1')
+    assert {(d.artifact, d.version, d.scope) for d in graph.dependencies()} == {
+        ('a', '1', 'compile'), ('t', '1', 'test'), ('o', '1', 'compile'),
+        # b is managed by the root, c of a is nearer than c of b, x is excluded, p & q are pruned
+        ('b', '9', 'compile'), ('c', '1', 'runtime'), ('d', '1', 'test'), ('e', '1', 'compile')}
+    c = next(i for i, d in enumerate(graph.nodes) if d.artifact == 'c')
+    assert [p.artifact for p in graph.path(c)] == ['root', 'a', 'c']
+    assert graph.depths[c] == 2
+    # the direct dependencies of every coordinate are expanded once
+    assert ('g', 'a', '1') in resolver._direct and len(resolver.resolve('g', 'root', '1')) == len(graph)
+    runtime = TransitiveResolver(url_handlers=[handler], registry=POMRegistry(), scopes=['compile', 'runtime'],
+                                 on_error=None)
+    assert {d.artifact for d in runtime.resolve('g', 'root', '1').dependencies()} == {'a', 'b', 'c', 'o', 'e'}
@@ -0,0 +1,44 @@
+from pom_helper import POM, POMRegistry, Metrics, Trace, Listeners, set_listener
+from pom_helper.test.stub import PARENT, CHILD
+
+
+def test_metrics_and_trace(repo):
+    metrics, trace = Metrics(), Trace()
+    child = CHILD.format('').encode()
+    repo.add('g', 'parent', '1', PARENT)
+    repo.add('g', 'child', '1', child)
+    repo.failures[repo.handler('g', 'parent', '1')[len(repo.url):]] = [503]
+    set_listener(Listeners([metrics, trace]))
+    try:
+        POM.from_coordinate('g', 'child', '1', url_handlers=[repo.handler], registry=POMRegistry()).get_dependencies()
+    finally:
+        set_listener(None)
+    snapshot = metrics.snapshot()
+    assert snapshot['timers']['fetch']['count'] == 2
+    assert snapshot['timers']['download']['count'] == 2
+    assert snapshot['counters']['retries'] == 1
+    assert snapshot['counters']['bytes'] == len(PARENT) + len(child)
+    assert snapshot['poms']['g:child:1']['depth'] == 1
+    assert snapshot['poms']['g:parent:1']['size'] == len(PARENT)
+    assert set(metrics.slowest(2)) == {'g:child:1', 'g:parent:1'}
+    # the child's dependencies needed the parent's management
+    root = trace.roots[0]
+    assert (root.pom, root.getter) == ('g:child:1', 'get_dependencies')
+    assert 'g:parent:1 get_dependencies_management_index' in trace.format()
+
+
+def test_bytes_on_the_wire(repo):
+    metrics = Metrics()
+    content = PARENT.replace(b'</project>', b'<!--' + b'x' * 10000 + b'--></project>')
+    repo.gzip = True
+    repo.add('g', 'parent', '1', content)
+    set_listener(metrics)
+    try:
+        assert POM.from_coordinate('g', 'parent', '1', url_handlers=[repo.handler],
+                                   registry=POMRegistry()).get_properties() == {'x.version': '2.0'}
+    finally:
+        set_listener(None)
+    snapshot = metrics.snapshot()
+    # the gzipped body, not the pom
+    assert 0 < snapshot['counters']['bytes'] < len(content) // 10
+    assert snapshot['poms']['g:parent:1']['size'] == len(content)
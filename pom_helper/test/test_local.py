@@ -0,0 +1,101 @@
+import os
+import shutil
+
+from pom_helper import POM, POMRegistry, LocalRepository
+
+CASE = 'pom_helper/test/cases/au.csiro.aehrc.variant-spark.variant-spark_2.12.0.5.2.pom'
+
+
+def install(root, group, artifact, version):
+    d = root / os.path.join(*group.split('.')) / artifact / version
+    d.mkdir(parents=True)
+    shutil.copy(CASE, str(d / '{}-{}.pom'.format(artifact, version)))
+    (d / '{}-{}.jar'.format(artifact, version)).write_bytes(b'')
+    return d
+
+
+def touch(*dirs):
+    # make the change visible even on a file system of coarse mtime
+    for d in dirs:
+        st = os.stat(str(d))
+        os.utime(str(d), (st.st_atime, st.st_mtime + 10))
+
+
+def test_index(tmp_path):
+    root = tmp_path / 'repository'
+    install(root, 'au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2')
+    index = tmp_path / 'index.json'
+    repo = LocalRepository(str(root), index_file=str(index))
+    assert len(repo) == 1 and repo('g', 'a', '1') is None
+    p = POM.from_coordinate('au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2', url_handlers=[repo],
+                            registry=POMRegistry())
+    assert len(p.get_dependencies()) == 18
+
+    # a new version, & a removed artifact
+    d = install(root, 'au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.3')
+    touch(d.parent)
+    assert repo.refresh() >= 2 and ('au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.3') in repo
+    shutil.rmtree(str(d))
+    touch(d.parent)
+    repo.refresh()
+    assert ('au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.3') not in repo
+
+    # the index is loaded back without scanning
+    assert len(LocalRepository(str(root), index_file=str(index))) == 1
+
+
+def test_refresh_unchanged(tmp_path, monkeypatch):
+    root = tmp_path / 'repository'
+    for i in range(20):
+        install(root, 'org.example.g{}'.format(i % 4), 'a{}'.format(i), '1.0')
+    repo = LocalRepository(str(root))
+    assert len(repo) == 20
+
+    calls = {'scandir': 0, 'stat': 0}
+    scandir, stat = os.scandir, os.stat
+
+    def counting_scandir(*args, **kwargs):
+        calls['scandir'] += 1
+        return scandir(*args, **kwargs)
+
+    def counting_stat(*args, **kwargs):
+        calls['stat'] += 1
+        return stat(*args, **kwargs)
+
+    monkeypatch.setattr(os, 'scandir', counting_scandir)
+    monkeypatch.setattr(os, 'stat', counting_stat)
+    # nothing changed: every directory is stat once, & none is listed
+    assert repo.refresh() == 0
+    assert calls == {'scandir': 0, 'stat': len(repo._dirs)}
+    assert len(repo) == 20
+
+
+def test_lookup_during_refresh(tmp_path, monkeypatch):
+    root = tmp_path / 'repository'
+    d = install(root, 'au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2')
+    repo = LocalRepository(str(root))
+    coordinate = ('au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2')
+    (d / 'extra.txt').write_text('')
+    touch(d)
+    seen = []
+    scandir = os.scandir
+
+    # a lookup from another thread while the changed directory is listed
+    def looking_scandir(path):
+        seen.append(repo(*coordinate))
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', looking_scandir)
+    assert repo.refresh() == 1
+    assert seen and all(seen) and coordinate in repo
+
+
+def test_corrupt_index(tmp_path):
+    root = tmp_path / 'repository'
+    install(root, 'au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2')
+    index = tmp_path / 'index.json'
+    LocalRepository(str(root), index_file=str(index))
+    index.write_text(index.read_text()[:-10])
+    # scanned again, & the index rewritten
+    assert len(LocalRepository(str(root), index_file=str(index))) == 1
+    assert len(LocalRepository(str(root), index_file=str(index))) == 1
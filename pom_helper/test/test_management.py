@@ -0,0 +1,44 @@
+from pom_helper import POM, POMRegistry
+
+POMS = {
+    'parent': '''<project>
+      <groupId>g</groupId><artifactId>parent</artifactId><version>1</version>
+      <dependencyManagement><dependencies>
+        <dependency><groupId>x</groupId><artifactId>a</artifactId><version>1.0</version></dependency>
+        <dependency><groupId>x</groupId><artifactId>b</artifactId><version>1.0</version></dependency>
+        <dependency><groupId>g</groupId><artifactId>bom</artifactId><version>1</version><scope>import</scope></dependency>
+      </dependencies></dependencyManagement>
+    </project>''',
+    'bom': '''<project>
+      <groupId>g</groupId><artifactId>bom</artifactId><version>1</version>
+      <dependencyManagement><dependencies>
+        <dependency><groupId>x</groupId><artifactId>b</artifactId><version>9.9</version></dependency>
+        <dependency><groupId>x</groupId><artifactId>c</artifactId><version>3.0</version></dependency>
+      </dependencies></dependencyManagement>
+    </project>''',
+    'child': '''<project>
+      <parent><groupId>g</groupId><artifactId>parent</artifactId><version>1</version></parent>
+      <artifactId>child</artifactId>
+      <dependencyManagement><dependencies>
+        <dependency><groupId>x</groupId><artifactId>a</artifactId><version>2.0</version></dependency>
+        <dependency><groupId>x</groupId><artifactId>d</artifactId><scope>test</scope></dependency>
+      </dependencies></dependencyManagement>
+      <dependencies>
+        <dependency><groupId>x</groupId><artifactId>a</artifactId></dependency>
+        <dependency><groupId>x</groupId><artifactId>b</artifactId></dependency>
+        <dependency><groupId>x</groupId><artifactId>c</artifactId></dependency>
+        <dependency><groupId>x</groupId><artifactId>d</artifactId></dependency>
+      </dependencies>
+    </project>''',
+}
+
+
+def test_management_index(disk_repo):
+    for name, content in POMS.items():
+        disk_repo.add('g', name, '1', content)
+    p = POM.from_coordinate('g', 'child', '1', url_handlers=[disk_repo.handler], registry=POMRegistry())
+    index = p.get_dependencies_management_index()
+    assert {k: d.version for k, d in index.items() if k[0] == 'x'} == {
+        ('x', 'a'): '2.0', ('x', 'b'): '1.0', ('x', 'c'): '3.0', ('x', 'd'): None}
+    assert list(index.values()) == p.get_dependencies_management()
+    assert {d.artifact: d.version for d in p.get_dependencies()} == {'a': '2.0', 'b': '1.0', 'c': '3.0', 'd': None}
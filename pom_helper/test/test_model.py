@@ -0,0 +1,30 @@
+import pytest
+
+from pom_helper import POM, POMError
+from pom_helper.model import parse_model
+
+CASE = 'pom_helper/test/cases/au.csiro.aehrc.variant-spark.variant-spark_2.12.0.5.2.pom'
+
+
+def test_parse_model():
+    with open(CASE, 'rb') as f:
+        model = parse_model(f.read())
+    assert (model.group, model.artifact, model.version, model.parent) == \
+           ('au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2', None)
+    assert model.properties['scala.binary.version'] == '2.12'
+    assert [p.id for p in model.profiles] == ['release', 'scala_2.10', 'cdh5.8.2', 'cdh5.9.0', 'no-perf',
+                                              'slow-test', 'regression-test']
+    assert model.profiles[1].properties == {'scala.binary.version': '2.10', 'scala.version': '2.10.6'}
+    # <build> declares plugin dependencies, they are not the project's
+    assert all(d.artifact != 'scala-maven-plugin' for d in model.dependencies)
+
+
+def test_low_memory():
+    with open(CASE, 'rb') as f:
+        plain = f.read()
+    full = POM.from_bytes(plain)
+    p = POM.from_bytes(plain, low_memory=True)
+    assert set(p.get_dependencies()) == set(full.get_dependencies())
+    with pytest.raises(POMError):
+        p.get_root()
+    assert full.get_root() is not None
@@ -0,0 +1,76 @@
+from pom_helper import POM, ActivationContext
+
+PARENT = '''<project>
+  <groupId>g</groupId><artifactId>parent</artifactId><version>1</version>
+  <properties><scala.binary.version>2.12</scala.binary.version></properties>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>x</groupId><artifactId>managed</artifactId><version>5</version></dependency>
+  </dependencies></dependencyManagement>
+  <profiles>
+    <profile><id>parent-linux</id><activation><os><family>unix</family></os></activation>
+      <dependencies><dependency><groupId>x</groupId><artifactId>native</artifactId><version>1</version></dependency></dependencies>
+    </profile>
+  </profiles>
+</project>'''
+
+CHILD = '''<project>
+  <parent><groupId>g</groupId><artifactId>parent</artifactId><version>1</version></parent>
+  <artifactId>child</artifactId>
+  <dependencies>
+    <dependency><groupId>org.apache.spark</groupId><artifactId>spark-core_${scala.binary.version}</artifactId><version>3</version></dependency>
+  </dependencies>
+  <profiles>
+    <profile><id>default</id><activation><activeByDefault>true</activeByDefault></activation>
+      <dependencies><dependency><groupId>x</groupId><artifactId>default</artifactId><version>1</version></dependency></dependencies>
+    </profile>
+    <profile><id>scala_2.13</id>
+      <activation><property><name>scala</name><value>2.13</value></property><jdk>[11,)</jdk></activation>
+      <properties><scala.binary.version>2.13</scala.binary.version></properties>
+      <dependencies><dependency><groupId>x</groupId><artifactId>managed</artifactId></dependency></dependencies>
+    </profile>
+    <profile><id>ci</id><activation><file><exists>${basedir}/ci.txt</exists></file></activation></profile>
+  </profiles>
+</project>'''
+
+
+def pom(disk_repo):
+    disk_repo.add('g', 'parent', '1', PARENT)
+    return POM.from_string(CHILD, url_handlers=[disk_repo.handler])
+
+
+def coordinates(deps):
+    return {(d.artifact, d.version) for d in deps}
+
+
+def test_views(disk_repo):
+    p = pom(disk_repo)
+    profile = p.get_profiles()['scala_2.13']
+    # a view shares the pom's parent & reads its own part of the model
+    assert profile.get_parent() is p.get_parent()
+    assert profile.get_artifact() == 'child'
+    assert coordinates(profile.get_dependencies()) == {('managed', '5')}
+    assert profile.get_effective_properties()['scala.binary.version'] == '2.13'
+
+
+def test_activation(tmp_path, disk_repo):
+    p = pom(disk_repo)
+    windows = ActivationContext(os_family='windows', jdk='17.0.2', basedir=str(tmp_path))
+    assert p.get_active_profiles(context=windows) == ['default']
+    assert p.get_active_profiles(context=ActivationContext(properties={'scala': '2.13'}, jdk='1.8')) == ['default']
+    assert p.get_active_profiles(context=ActivationContext(properties={'scala': '2.13'}, jdk='17')) == ['scala_2.13']
+    assert p.get_active_profiles(['ci', '!default']) == ['ci']
+    (tmp_path / 'ci.txt').write_text('')
+    assert p.get_active_profiles(context=windows) == ['ci']
+
+
+def test_effective_dependencies(disk_repo):
+    p = pom(disk_repo)
+    assert coordinates(p.get_effective_dependencies(context=ActivationContext(os_family='windows'))) == {
+        ('spark-core_2.12', '3'), ('default', '1')}
+    # profile properties apply to the whole pom, like maven merges them before interpolation
+    linux = ActivationContext(os_family='unix', properties={'scala': '2.13'}, jdk='11')
+    assert coordinates(p.get_effective_dependencies(context=linux)) == {
+        ('spark-core_2.13', '3'), ('managed', '5'), ('native', '1')}
+    assert p.activate(context=linux) is p.activate(context=linux)
+    # nothing changes the pom itself
+    assert coordinates(p.get_dependencies()) == {('spark-core_2.12', '3')}
@@ -0,0 +1,52 @@
+import pytest
+
+from pom_helper import POM, POMError
+
+PARENT = '''<project>
+  <groupId>g</groupId><artifactId>parent</artifactId><version>1</version>
+  <properties>
+    <scala.binary.version>2.12</scala.binary.version>
+    <scala.version>${scala.binary.version}.17</scala.version>
+    <spark.version>3.3.2</spark.version>
+  </properties>
+</project>'''
+
+CHILD = '''<project>
+  <parent><groupId>g</groupId><artifactId>parent</artifactId><version>${parent.version}</version></parent>
+  <artifactId>child_${scala.binary.version}</artifactId>
+  <properties>
+    <parent.version>1</parent.version>
+    <spark.version>${spark.version}</spark.version>
+    <scala.binary.version>2.13</scala.binary.version>
+    <a>${b}</a>
+    <b>${a}</b>
+  </properties>
+  <dependencies>
+    <dependency><groupId>org.scala-lang</groupId><artifactId>scala-library</artifactId><version>${scala.version}</version></dependency>
+    <dependency><groupId>org.apache.spark</groupId><artifactId>spark-core_${scala.binary.version}</artifactId><version>${spark.version}</version></dependency>
+    <dependency><groupId>${project.groupId}</groupId><artifactId>sibling</artifactId><version>${project.parent.version}</version></dependency>
+  </dependencies>
+</project>'''
+
+
+def pom(disk_repo, child=CHILD):
+    disk_repo.add('g', 'parent', '1', PARENT)
+    return POM.from_string(child, url_handlers=[disk_repo.handler])
+
+
+def test_interpolation(disk_repo):
+    p = pom(disk_repo)
+    assert p.get_artifact() == 'child_${scala.binary.version}'
+    assert {(d.group, d.artifact, d.version) for d in p.get_dependencies()} == {
+        ('org.scala-lang', 'scala-library', '2.13.17'),
+        ('org.apache.spark', 'spark-core_2.13', '3.3.2'),
+        ('g', 'sibling', '1')}
+    assert p.get_effective_properties()['spark.version'] == '3.3.2'
+
+
+def test_cycle(disk_repo):
+    with pytest.raises(POMError):
+        pom(disk_repo)._check_ref('${a}')
+    with pytest.raises(POMError):
+        pom(disk_repo, CHILD.replace('<artifactId>child_', '<version>${project.version}</version><artifactId>child_')) \
+            .get_version()
@@ -0,0 +1,72 @@
+from pom_helper import Reactor, TransitiveResolver
+
+ROOT = '''<project>
+  <groupId>g</groupId><artifactId>root</artifactId><version>${revision}</version>
+  <properties><revision>1.0-SNAPSHOT</revision></properties>
+  <modules><module>bom</module><module>core</module><module>app/pom.xml</module></modules>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>g</groupId><artifactId>bom</artifactId><version>${project.version}</version><scope>import</scope></dependency>
+  </dependencies></dependencyManagement>
+</project>'''
+
+BOM = '''<project>
+  <groupId>g</groupId><artifactId>bom</artifactId><version>1.0-SNAPSHOT</version>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>x</groupId><artifactId>y</artifactId><version>2.0</version></dependency>
+  </dependencies></dependencyManagement>
+</project>'''
+
+CORE = '''<project>
+  <parent><groupId>g</groupId><artifactId>root</artifactId><version>${revision}</version></parent>
+  <artifactId>core</artifactId>
+  <dependencies><dependency><groupId>x</groupId><artifactId>y</artifactId></dependency></dependencies>
+</project>'''
+
+APP = '''<project>
+  <parent><groupId>g</groupId><artifactId>root</artifactId><version>1.0-SNAPSHOT</version><relativePath/></parent>
+  <artifactId>app</artifactId>
+  <dependencies><dependency><groupId>g</groupId><artifactId>core</artifactId><version>${project.version}</version></dependency></dependencies>
+</project>'''
+
+
+def test_reactor(tmp_path):
+    for path, content in [('pom.xml', ROOT), ('bom/pom.xml', BOM), ('core/pom.xml', CORE), ('app/pom.xml', APP)]:
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text(content)
+    asked = []
+
+    def handler(group, artifact, version):
+        asked.append((group, artifact, version))
+        return None
+
+    reactor = Reactor(str(tmp_path), url_handlers=[handler])
+    assert len(reactor) == 4
+    assert set(reactor.coordinates()) == {('g', a, '1.0-SNAPSHOT') for a in ['root', 'bom', 'core', 'app']}
+    core = reactor.get('g', 'core', '1.0-SNAPSHOT')
+    root = reactor.get('g', 'root', '1.0-SNAPSHOT')
+    # linked by <relativePath>, or by coordinate through the registry
+    assert core.get_parent() is root and reactor.get('g', 'app', '1.0-SNAPSHOT').get_parent() is root
+    # the sibling bom is imported from disk
+    assert [(d.artifact, d.version) for d in core.get_dependencies()] == [('y', '2.0')]
+    graph = TransitiveResolver(url_handlers=[handler], registry=reactor.registry, on_error=None) \
+        .resolve('g', 'app', '1.0-SNAPSHOT')
+    assert [(d.artifact, d.version) for d in graph.dependencies()] == [('core', '1.0-SNAPSHOT'), ('y', '2.0')]
+    # nothing of the project went to the handlers
+    assert asked == [('x', 'y', '2.0')]
+
+
+def test_profile_modules_and_parent_version(tmp_path):
+    root = ROOT.replace('<module>app/pom.xml</module></modules>',
+                        '</modules><profiles><profile><id>app</id><modules><module>app</module></modules></profile>'
+                        '</profiles>')
+    # a parent at the default <relativePath> of another version is not the parent asked for
+    core = CORE.replace('<version>${revision}</version>', '<version>0.9</version>')
+    for path, content in [('pom.xml', root), ('bom/pom.xml', BOM), ('core/pom.xml', core), ('app/pom.xml', APP)]:
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text(content)
+    reactor = Reactor(str(tmp_path), url_handlers=[lambda g, a, v: None])
+    assert len(reactor) == 4
+    assert reactor.get('g', 'app', '1.0-SNAPSHOT').get_parent() is reactor.get('g', 'root', '1.0-SNAPSHOT')
+    # so it is asked by coordinate
+    parent = reactor.get('g', 'core', '0.9').get_parent()
+    assert parent is not reactor.get('g', 'root', '1.0-SNAPSHOT') and parent.name() == 'g:root:0.9'
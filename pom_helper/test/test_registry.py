@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from pom_helper import POM, POMRegistry, POMError, HTTPTransport, set_transport, resolve_many
+from pom_helper.test.stub import PARENT, CHILD
+
+CASES = os.path.abspath('pom_helper/test/cases')
+
+
+def case_handler(group: str, artifact: str, version: str):
+    return 'file://{}/{}.{}.{}.pom'.format(CASES, group, artifact, version)
+
+
+def test_shared_coordinate():
+    registry = POMRegistry(maxsize=2)
+    p = POM.from_coordinate('au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2',
+                            url_handlers=[case_handler], registry=registry)
+    q = POM.from_coordinate('au.csiro.aehrc.variant-spark', 'variant-spark_2.12', '0.5.2',
+                            url_handlers=[case_handler], registry=registry)
+    assert p is q and len(p.get_dependencies()) == 18
+    assert registry.hits == 1 and registry.misses == 1
+
+
+def test_lru_eviction():
+    registry = POMRegistry(maxsize=2)
+    a = POM.from_coordinate('g', 'a', '1', url_handlers=[case_handler], registry=registry)
+    POM.from_coordinate('g', 'b', '1', url_handlers=[case_handler], registry=registry)
+    assert POM.from_coordinate('g', 'a', '1', url_handlers=[case_handler], registry=registry) is a
+    POM.from_coordinate('g', 'c', '1', url_handlers=[case_handler], registry=registry)
+    # `b` is the least recently used, so it is evicted instead of `a`
+    assert registry.stats()['evictions'] == 1
+    assert POM.from_coordinate('g', 'a', '1', url_handlers=[case_handler], registry=registry) is a
+
+
+def test_recover_from_failure(repo):
+    repo.add('g', 'parent', '1', PARENT)
+    repo.add('g', 'child', '1', CHILD.format(''))
+    path = repo.handler('g', 'parent', '1')[len(repo.url):]
+    set_transport(HTTPTransport(retries=1, backoff=0))
+    registry = POMRegistry()
+    repo.failures[path] = [503, 503]
+    p = POM.from_coordinate('g', 'child', '1', url_handlers=[repo.handler], registry=registry)
+    with pytest.raises(POMError):
+        p.get_dependencies()
+    assert repo.requests[path] == 2
+    # the repository is back: neither the parent nor the child holding it stay failed
+    q = POM.from_coordinate('g', 'child', '1', url_handlers=[repo.handler], registry=registry)
+    assert [d.artifact for d in q.get_dependencies()] == ['y'] and repo.requests[path] == 3
+
+    # the same when the parent is loaded by a resolver
+    registry = POMRegistry()
+    repo.failures[path] = [503, 503]
+    errors = []
+    assert not list(resolve_many([('g', 'child', '1')], url_handlers=[repo.handler], registry=registry,
+                                 on_error=lambda package, e: errors.append(e)))
+    assert errors and repo.requests[path] == 5
+    q = POM.from_coordinate('g', 'child', '1', url_handlers=[repo.handler], registry=registry)
+    assert [d.artifact for d in q.get_dependencies()] == ['y'] and repo.requests[path] == 6
@@ -0,0 +1,21 @@
+from pom_helper import POMRegistry, POMError, resolve_many
+from pom_helper.test.stub import PARENT, CHILD
+
+
+def test_resolve_many(repo):
+    repo.add('g', 'parent', '1', PARENT)
+    for i in range(10):
+        repo.add('g', 'child{}'.format(i), '1', CHILD.format(i))
+    repo.add('g', 'orphan', '1', CHILD.format('').replace('<artifactId>parent', '<artifactId>none'))
+    errors = {}
+    coordinates = [('g', 'child{}'.format(i), '1') for i in range(10)] + [('g', 'none', '1'), ('g', 'orphan', '1')]
+    results = dict(resolve_many(coordinates, workers=4, url_handlers=[repo.handler], registry=POMRegistry(),
+                                on_error=lambda p, e: errors.setdefault(p.artifact, e), batch=4))
+    assert len(results) == 10
+    assert all([(d.group, d.artifact, d.version) for d in deps] == [('x', 'y', '2.0')] for deps in results.values())
+    assert set(errors) == {'none', 'orphan'}
+    # the pom which is missing is told, with why
+    assert str(errors['orphan']).startswith('[POM] fail to load g:none:1: g:none:1 is not found in http://')
+    assert isinstance(errors['orphan'].__cause__, POMError)
+    # the shared parent is fetched once for all the children
+    assert repo.requests['/g/parent/1/parent-1.pom'] == 1
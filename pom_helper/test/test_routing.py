@@ -0,0 +1,51 @@
+import time
+
+from pom_helper import HTTPTransport, RouteStats, DiskCache
+from pom_helper.pom_helper import fetch
+from pom_helper.stub import StubRepository
+
+
+def test_race_prefers_handler_order():
+    with StubRepository() as first, StubRepository() as second:
+        second.add('g', 'a', '1', b'second')
+        urls = [first.handler('g', 'a', '1'), second.handler('g', 'a', '1')]
+        transport = HTTPTransport(backoff=0)
+        assert fetch(urls, transport=transport, race=True, routes=None) == 'second'
+        first.add('g', 'a', '1', b'first')
+        assert fetch(urls, transport=transport, race=True, routes=None) == 'first'
+
+
+def test_demote_repository_without_group():
+    routes = RouteStats(demote_after=2)
+    with StubRepository() as mirror, StubRepository() as central:
+        for v in ['1', '2', '3']:
+            central.add('org.x.y', 'a', v, b'central')
+        transport = HTTPTransport(backoff=0)
+        for v in ['1', '2']:
+            urls = [mirror.handler('org.x.y', 'a', v), central.handler('org.x.y', 'a', v)]
+            assert fetch(urls, transport=transport, group='org.x.y', routes=routes) == 'central'
+        # the mirror never served `org.x`, so it is no longer asked first
+        urls = [mirror.handler('org.x.z', 'a', '3'), central.handler('org.x.z', 'a', '3')]
+        assert routes.order(urls, 'org.x.z') == list(reversed(urls))
+        urls = [mirror.handler('org.x.y', 'a', '3'), central.handler('org.x.y', 'a', '3')]
+        assert fetch(urls, transport=transport, group='org.x.y', routes=routes) == 'central'
+        assert sum(mirror.requests.values()) == 2
+
+
+def test_race_cancels_losers(tmp_path):
+    routes = RouteStats(demote_after=1)
+    cache = DiskCache(str(tmp_path))
+    with StubRepository() as first, StubRepository() as slow, StubRepository() as demoted:
+        first.add('g', 'a', '1', b'first')
+        slow.delay = 0.3
+        slow.failures[slow.handler('g', 'a', '1')[len(slow.url):]] = [503, 503]
+        transport = HTTPTransport(backoff=0)
+        routes.record(demoted.handler('g', 'a', '1'), 'g', hit=False)
+        urls = [first.handler('g', 'a', '1'), slow.handler('g', 'a', '1'), demoted.handler('g', 'a', '1')]
+        assert fetch(urls, cache=cache, transport=transport, group='g', race=True, routes=routes) == 'first'
+        # the demoted repository is not raced
+        assert not demoted.requests
+        # the loser in flight gives up its retries, & leaves no miss in the routes nor the cache
+        time.sleep(0.6)
+        assert sum(slow.requests.values()) == 1
+        assert not cache.is_missing(urls[1]) and routes.stats().get((slow.url + '/', 'g')) is None
@@ -0,0 +1,67 @@
+import zlib
+
+import pytest
+
+from pom_helper import POM, POMRegistry, POMError, ActivationContext
+from pom_helper.snapshot import dumps, loads, HEADER, MAGIC, FORMAT_VERSION
+
+PARENT = '''<project>
+  <groupId>g</groupId><artifactId>parent</artifactId><version>1</version>
+  <properties><x.version>2.0</x.version></properties>
+  <dependencyManagement><dependencies>
+    <dependency><groupId>x</groupId><artifactId>y</artifactId><version>${x.version}</version></dependency>
+  </dependencies></dependencyManagement>
+</project>'''
+
+CHILD = '''<project>
+  <parent><groupId>g</groupId><artifactId>parent</artifactId><version>1</version></parent>
+  <artifactId>child</artifactId>
+  <dependencies>
+    <dependency><groupId>x</groupId><artifactId>y</artifactId>
+      <exclusions><exclusion><groupId>z</groupId><artifactId>*</artifactId></exclusion></exclusions>
+    </dependency>
+  </dependencies>
+  <profiles>
+    <profile><id>p</id><properties><x.version>3.0</x.version></properties></profile>
+    <profile><id>q</id><activation><property><name>q</name></property></activation>
+      <dependencies><dependency><groupId>x</groupId><artifactId>q</artifactId></dependency></dependencies>
+    </profile>
+  </profiles>
+</project>'''
+
+
+def test_round_trip(disk_repo):
+    disk_repo.add('g', 'parent', '1', PARENT)
+    disk_repo.add('g', 'child', '1', CHILD)
+    child = POM.from_coordinate('g', 'child', '1', url_handlers=[disk_repo.handler], registry=POMRegistry())
+    data = dumps([child, child.get_parent()])
+
+    # nothing is left to fetch or parse
+    def offline(group, artifact, version):
+        return disk_repo.handler(group, 'none', version)
+
+    registry = POMRegistry()
+    loaded, parent = loads(data, url_handlers=[offline], registry=registry)
+    assert loaded.get_dependencies() == child.get_dependencies()
+    assert loaded.get_dependencies()[0].exclusions == (('z', '*'),)
+    assert loaded.get_dependencies_management() == child.get_dependencies_management()
+    assert loaded.get_parent() is parent and parent.get_effective_properties() == {'x.version': '2.0'}
+    assert loaded.get_profiles()['p'].get_properties()['x.version'] == '3.0'
+    # what is read from the model is answered offline too
+    context = ActivationContext(properties={'q': 'true'})
+    assert loaded.get_profiles()['q'].is_active(context) and loaded.get_active_profiles(context=context) == ['q']
+    effective = loaded.get_effective_dependencies(context=context)
+    assert effective == child.get_effective_dependencies(context=context) and len(effective) == 2
+    assert POM.from_coordinate('g', 'child', '1', url_handlers=[offline], registry=registry) is loaded
+
+
+def test_reject_stale():
+    data = HEADER.pack(MAGIC, 0) + b'...'
+    with pytest.raises(POMError):
+        loads(data)
+
+
+def test_reject_corrupt():
+    for body in (b'...', zlib.compress(b'...'), zlib.compress(b'[["a"], [[5]]]')):
+        with pytest.raises(POMError):
+            loads(HEADER.pack(MAGIC, FORMAT_VERSION) + body)
@@ -0,0 +1,56 @@
+import sqlite3
+import zlib
+
+import pytest
+
+from pom_helper import POM, Package, POMError, DependencyTable, export_sqlite
+from pom_helper.table import HEADER, MAGIC, FORMAT_VERSION
+
+
+def results():
+    with open('pom_helper/test/cases/au.csiro.aehrc.variant-spark.variant-spark_2.12.0.5.2.pom', 'rb') as f:
+        pom = POM.from_bytes(f.read())
+    deps = pom.get_dependencies()
+    return [(Package(group='g', artifact='a{}'.format(i), version='1'), deps) for i in range(3)]
+
+
+def test_compact():
+    (_, deps), = results()[:1]
+    assert not hasattr(deps[0], '__dict__')
+    # the same strings are shared across poms
+    again = results()[0][1]
+    assert deps[0].group is again[0].group and deps[0].scope is again[0].scope
+
+
+def test_table_round_trip():
+    rs = results()
+    table = DependencyTable().extend(rs)
+    assert len(table) == 3 * len(rs[0][1])
+    d = rs[0][1][0]
+    assert table.row(0) == ('g', 'a0', '1', d.group, d.artifact, d.version, d.scope, d.optional)
+    loaded = DependencyTable.loads(table.dumps())
+    assert list(loaded.rows()) == list(table.rows())
+    assert loaded.column('source_artifact')[-1] == 'a2'
+    assert len(DependencyTable.loads(DependencyTable().dumps())) == 0
+
+
+def test_reject_corrupt():
+    data = DependencyTable().extend(results()).dumps()
+    body = zlib.decompress(data[HEADER.size:])
+    for corrupt in (data[:-1], HEADER.pack(MAGIC, FORMAT_VERSION) + zlib.compress(body[:-1]),
+                    HEADER.pack(MAGIC, FORMAT_VERSION) + b'...'):
+        with pytest.raises(POMError):
+            DependencyTable.loads(corrupt)
+
+
+def test_export_sqlite(tmp_path):
+    rs = results()
+    path = str(tmp_path / 'deps.db')
+    assert export_sqlite(iter(rs), path, batch=1) == 3 * len(rs[0][1])
+    with sqlite3.connect(path) as db:
+        rows = db.execute('SELECT artifact, version FROM dependencies_text WHERE source_artifact = ? '
+                          'AND artifact = ?', ('a1', 'junit')).fetchall()
+        assert rows == [('junit', '4.13.1')]
+        # dictionary-encoded, every string once
+        assert db.execute('SELECT COUNT(*) FROM strings WHERE value = ?', ('compile',)).fetchone() == (1,)
+    assert export_sqlite(DependencyTable().extend(rs[:1]), path) == len(rs[0][1])
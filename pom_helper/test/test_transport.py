@@ -0,0 +1,27 @@
+from pom_helper import POM, POMRegistry, HTTPTransport
+from pom_helper.pom_helper import fetch
+from pom_helper.test.stub import PARENT, CHILD
+
+
+def test_resolve_through_transport(repo):
+    repo.add('g', 'parent', '1', PARENT)
+    repo.add('g', 'child', '1', CHILD.format(''))
+    p = POM.from_coordinate('g', 'child', '1', url_handlers=[repo.handler], registry=POMRegistry())
+    assert [(d.group, d.artifact, d.version) for d in p.get_dependencies()] == [('x', 'y', '2.0')]
+
+
+def test_bounded_retries(repo):
+    repo.add('g', 'a', '1', PARENT)
+    url = repo.handler('g', 'a', '1')
+    path = url[len(repo.url):]
+    repo.failures[path] = [503, 503]
+    assert fetch([url], transport=HTTPTransport(retries=2, backoff=0)) == PARENT.decode()
+    assert repo.requests[path] == 3
+    # gives up once the retries run out, instead of looping forever
+    repo.failures[path] = [503, 503, 503]
+    assert fetch([url], transport=HTTPTransport(retries=1, backoff=0)) is None
+    assert repo.requests[path] == 5
+
+
+def test_missing(repo):
+    assert fetch([repo.handler('g', 'a', '1')], transport=HTTPTransport(backoff=0)) is None
@@ -0,0 +1,152 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Mapping
+
+import requests
+from attr import dataclass
+from requests.adapters import HTTPAdapter
+
+from .instrument import get_listener
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 8.0
+
+# Bytes read at once from a body which may be given up
+CHUNK_SIZE = 64 * 1024
+
+# Statuses worth another try, anything else is answered by the repository for good
+RETRY_STATUS = frozenset([429, 500, 502, 503, 504])
+
+
+class TransportError(Exception):
+    def __init__(self, url, cause):
+        self.url = url
+        self.cause = cause
+
+    def __str__(self):
+        return '[POM] fail to download {}: {}'.format(self.url, self.cause)
+
+
+# The request was given up by its caller, e.g. the loser of a race
+class TransportCancelled(TransportError):
+    def __init__(self, url):
+        super().__init__(url, 'cancelled')
+
+
+@dataclass
+class Response:
+    status: int
+    content: bytes
+    headers: Dict[str, str]
+    # bytes of the body as it was received, before it is decompressed; None if not known
+    received: Optional[int] = None
+
+
+def content_length(headers: Mapping[str, str]) -> Optional[int]:
+    try:
+        return int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+
+
+# What was read from the stream of a response, or else what it announced
+def _received(res: requests.Response) -> Optional[int]:
+    try:
+        return int(res.raw.tell())
+    except (AttributeError, TypeError, ValueError):
+        return content_length(res.headers)
+
+
+# Keep-alive transport shared by all downloads,
+# every connection of the pool is reused across poms instead of handshaking once per file
+class HTTPTransport:
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, max_backoff: float = DEFAULT_MAX_BACKOFF,
+                 session: Optional[requests.Session] = None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        if session is None:
+            session = requests.Session()
+            # retries are made by `get` itself, so that they are bounded & backed off in one place
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.session = session
+
+    # With `cancel`, the body is read by chunks & the request is given up once it is set,
+    # as well as the retries. A request still waiting for the response can't be interrupted though,
+    # it lasts at most the timeouts.
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None,
+            cancel: Optional[threading.Event] = None) -> Response:
+        attempt = 0
+        while True:
+            try:
+                if cancel is None:
+                    res = self.session.get(url, headers=headers, timeout=self.timeout)
+                    content = None
+                else:
+                    res = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
+                    content = self._read(url, res, cancel)
+                if res.status_code not in RETRY_STATUS or attempt >= self.retries:
+                    return Response(status=res.status_code, content=res.content if content is None else content,
+                                    headers=dict(res.headers), received=_received(res))
+                logging.warning('[POM] download {} fail with {}, retrying...'.format(url, res.status_code))
+                cause = str(res.status_code)
+            except requests.RequestException as e:
+                if attempt >= self.retries:
+                    raise TransportError(url, e)
+                logging.warning('[POM] download {} fail with {}, retrying...'.format(url, e))
+                cause = str(e)
+            if cancel is not None and cancel.is_set():
+                raise TransportCancelled(url)
+            retried(url, attempt + 1, cause)
+            time.sleep(min(self.max_backoff, self.backoff * (2 ** attempt)))
+            attempt += 1
+
+    @staticmethod
+    def _read(url: str, res: requests.Response, cancel: threading.Event) -> bytes:
+        chunks = []
+        try:
+            for chunk in res.iter_content(CHUNK_SIZE):
+                if cancel.is_set():
+                    raise TransportCancelled(url)
+                chunks.append(chunk)
+        finally:
+            # the connection of a body left unread is dropped rather than put back in the pool
+            res.close()
+        return b''.join(chunks)
+
+    def close(self):
+        self.session.close()
+
+
+def retried(url: str, attempt: int, cause: str):
+    listener = get_listener()
+    if listener is not None:
+        listener.retried(url, attempt, cause)
+
+
+_transport: Optional[HTTPTransport] = None
+
+
+# Set the transport used by `fetch`, e.g. one pointing at a local stand-in server in tests
+def set_transport(transport: Optional[HTTPTransport]):
+    global _transport
+    _transport = transport
+
+
+def get_transport() -> HTTPTransport:
+    global _transport
+    if _transport is None:
+        _transport = HTTPTransport()
+    return _transport
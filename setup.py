@@ -11,5 +11,6 @@ setup(
     install_requires=[
         'lxml', 'requests', 'attrs'
     ],
-    extras_require={'test': ['pytest']}
+    extras_require={'test': ['pytest'], 'async': ['aiohttp']},
+    entry_points={'console_scripts': ['pom-helper=pom_helper.cli:main']}
 )